@@ -0,0 +1,49 @@
+# cache.py
+"""
+On-disk cache shared by the analysis passes.
+
+Entries are pickled objects under $XDG_CACHE_HOME/gitex/<namespace>/ (default ~/.cache).
+The cache is best-effort: unreadable entries count as misses and write failures are ignored.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+
+def cache_dir(namespace: str) -> Path:
+    """Return the cache directory for one kind of cached result."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "gitex" / namespace
+
+
+def entry_path(directory: Path, *key_parts: Any) -> Path:
+    """Return the entry for a key, hashed from its parts so any value can be used."""
+    key = ":".join(str(part) for part in key_parts)
+    return directory / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.pkl"
+
+
+def load(path: Path) -> Optional[Any]:
+    """Load a cached object, or None on a miss or unreadable entry."""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def store(path: Path, obj: Any) -> None:
+    """Atomically write an object to the cache."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
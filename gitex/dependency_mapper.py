@@ -1,13 +1,23 @@
 import ast
+import hashlib
+import io
 import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from collections import defaultdict
 import importlib.util
 
+from gitex import __version__, cache
 
-@dataclass
+# Slotted dataclasses (3.10+) drop the per-instance __dict__ on the many small records below
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class ImportInfo:
     """Represents an import statement and its details."""
     module: str
@@ -16,9 +26,10 @@ class ImportInfo:
     imported_names: List[str] = field(default_factory=list)
     is_external: bool = True
     line_number: int = 0
+    root_module: str = ''
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ClassInfo:
     """Represents class definition and inheritance information."""
     name: str
@@ -28,13 +39,13 @@ class ClassInfo:
     line_number: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FunctionInfo:
     """Represents function definition and call information."""
     name: str
     file_path: str
-    calls: List[str] = field(default_factory=list)
-    called_by: List[str] = field(default_factory=list)
+    calls: Set[str] = field(default_factory=set)
+    called_by: Set[str] = field(default_factory=set)
     line_number: int = 0
     is_method: bool = False
     class_name: Optional[str] = None
@@ -51,6 +62,59 @@ class DependencyAnalysis:
     function_call_graph: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
 
 
+@dataclass(**_SLOTS)
+class FileAnalysis:
+    """Per-file analysis results, merged into DependencyAnalysis."""
+    rel_path: str
+    imports: List[ImportInfo] = field(default_factory=list)
+    classes: Dict[str, ClassInfo] = field(default_factory=dict)
+    functions: Dict[str, FunctionInfo] = field(default_factory=dict)
+
+
+# Directories never descended into when discovering Python files (hidden ones are skipped too)
+PRUNED_DIRS = frozenset({
+    'venv', '__pycache__', 'node_modules',
+})
+
+# Build output directories, pruned unless they are packages themselves (e.g. mypkg/build/__init__.py)
+BUILD_DIRS = frozenset({'build', 'dist'})
+
+# Files larger than this are skipped by default (typically generated tables or data)
+DEFAULT_MAX_FILE_SIZE = 2_000_000
+
+# Generated code is not worth mapping. It is recognised by a marker on a comment line of the
+# leading comment block, so a docstring or later comment that mentions one doesn't count
+_GENERATED_HEADER_RE = re.compile(
+    rb'\A(?:\xef\xbb\xbf)?(?:[ \t\f\r]*(?:#[^\n]*)?\n)*?'
+    rb'[ \t\f]*#[^\n]*(?:@generated|Generated by the protocol buffer compiler)'
+)
+
+# Files without any of these tokens have nothing to map and are not parsed
+_SOURCE_TOKENS_RE = re.compile(rb'\b(?:import|class|def)\b')
+
+# Maps path separators to dots when turning file paths into module names
+_SEP_TABLE = str.maketrans(os.sep, '.')
+
+# Below this many files, process pool startup costs more than it saves
+PARALLEL_THRESHOLD = 32
+
+# Files handed to a pool worker per round trip
+PARALLEL_CHUNKSIZE = 16
+
+_FUNCTION_DEF_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Outside a function only these can contain imports or definitions; expressions there are not visited
+_STATEMENT_CONTAINERS: Tuple[type, ...] = (ast.stmt, ast.excepthandler) + (
+    (ast.match_case,) if sys.version_info >= (3, 10) else ()
+)
+
+# Bump whenever the pickled FileAnalysis layout changes, to invalidate old cache entries
+CACHE_FORMAT = 5
+
+# Leads every cache key: a new release or interpreter never reuses another one's analyses
+_CACHE_KEY = (CACHE_FORMAT, __version__, sys.version_info[:2])
+
+
 class DependencyMapper:
     """
     Analyzes Python codebases to extract dependency and relationship information.
@@ -64,11 +128,17 @@ class DependencyMapper:
     Designed to generate LLM-friendly summaries of codebase structure.
     """
     
-    def __init__(self, root_path: str):
+    def __init__(self, root_path: str, use_cache: bool = False, max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+                 respect_gitignore: bool = True):
         self.root_path = Path(root_path).resolve()
+        self.cache_dir: Optional[Path] = cache.cache_dir('dependencies') if use_cache else None
+        self.max_file_size = max_file_size
+        self.respect_gitignore = respect_gitignore
         self.analysis = DependencyAnalysis()
         self.python_files: List[Path] = []
-        self.project_modules: Set[str] = set()
+        self.project_modules: Dict[str, bool] = {}
+        # Content hash -> result, so duplicated (e.g. vendored) files are only parsed once
+        self._content_cache: Dict[bytes, Optional[FileAnalysis]] = {}
     
     def analyze(self, file_paths: Optional[List[str]] = None) -> DependencyAnalysis:
         """
@@ -83,138 +153,286 @@ class DependencyMapper:
         if file_paths:
             self.python_files = [Path(fp) for fp in file_paths if fp.endswith('.py')]
         else:
-            self.python_files = list(self.root_path.rglob('*.py'))
+            self.python_files = self._discover_python_files()
         
         # Build project module set for internal/external distinction
         self._build_project_modules()
         
-        # Analyze each file
-        for file_path in self.python_files:
-            try:
-                self._analyze_file(file_path)
-            except Exception as e:
-                # Continue analysis even if one file fails
-                print(f"Warning: Failed to analyze {file_path}: {e}")
-                continue
+        # Analyze each file, fanning out to worker processes for larger codebases
+        if len(self.python_files) < PARALLEL_THRESHOLD or not self._analyze_files_parallel():
+            for file_path in self.python_files:
+                try:
+                    self._analyze_file(file_path)
+                except Exception as e:
+                    # Continue analysis even if one file fails
+                    print(f"Warning: Failed to analyze {file_path}: {e}")
+                    continue
         
         # Build cross-file relationships
         self._build_relationships()
         
         return self.analysis
     
+    def _discover_python_files(self) -> List[Path]:
+        """
+        Walk root_path for .py files, pruning VCS, virtualenv and build directories,
+        and (unless disabled) anything matched by the root .gitignore.
+        """
+        # Imported here so pool workers, which never discover files, don't load the picker's models
+        from gitex.picker.base import load_gitignore_spec
+
+        spec = load_gitignore_spec(str(self.root_path)) if self.respect_gitignore else None
+        root_prefix_len = len(os.path.join(str(self.root_path), ''))
+        python_files = []
+        for dirpath, dirnames, filenames in os.walk(self.root_path):
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in PRUNED_DIRS and not d.startswith('.')
+                and (d not in BUILD_DIRS or os.path.isfile(os.path.join(dirpath, d, '__init__.py')))
+            ]
+            base = Path(dirpath)
+            if spec is None:
+                python_files.extend(base / filename for filename in filenames if filename.endswith('.py'))
+                continue
+
+            # Ignored directories are pruned here, so their contents are never listed
+            rel_dir = dirpath[root_prefix_len:].replace(os.sep, '/')
+            rel_prefix = f"{rel_dir}/" if rel_dir else ''
+            dirnames[:] = [d for d in dirnames if not spec.match_file(f"{rel_prefix}{d}/")]
+            python_files.extend(
+                base / filename for filename in filenames
+                if filename.endswith('.py') and not spec.match_file(rel_prefix + filename)
+            )
+        return python_files
+
     def _build_project_modules(self):
-        """Build set of internal project modules."""
+        """Build the internal project modules, mapped to whether each one is a package."""
+        project_modules: Dict[str, bool] = {}
+        root_prefix = os.path.join(str(self.root_path), '')
+        init_suffix = os.sep + '__init__.py'
         for py_file in self.python_files:
             # Convert file path to module name
-            rel_path = py_file.relative_to(self.root_path)
-            if rel_path.name == '__init__.py':
-                module_name = str(rel_path.parent).replace(os.sep, '.')
+            path_str = str(py_file)
+            if path_str.startswith(root_prefix):
+                rel_path = path_str[len(root_prefix):]
             else:
-                module_name = str(rel_path.with_suffix('')).replace(os.sep, '.')
-            
-            if module_name != '.':
-                self.project_modules.add(module_name)
-                # Add parent modules too
-                parts = module_name.split('.')
-                for i in range(1, len(parts)):
-                    self.project_modules.add('.'.join(parts[:i]))
+                rel_path = str(py_file.relative_to(self.root_path))
+
+            if rel_path == '__init__.py':
+                continue
+            if rel_path.endswith(init_suffix):
+                module_name = rel_path[:-len(init_suffix)].translate(_SEP_TABLE)
+                project_modules[module_name] = True
+            else:
+                if rel_path.endswith('.py'):
+                    rel_path = rel_path[:-3]
+                module_name = rel_path.translate(_SEP_TABLE)
+                # A package of the same name shadows the module on import
+                project_modules.setdefault(module_name, False)
+
+            # Add parent modules too
+            pos = module_name.find('.')
+            while pos != -1:
+                project_modules[module_name[:pos]] = True
+                pos = module_name.find('.', pos + 1)
+
+        # Read-only from here on, and shipped as-is to worker processes
+        self.project_modules = project_modules
     
     def _analyze_file(self, file_path: Path):
         """Analyze a single Python file for dependencies and relationships."""
+        self._merge_file_analysis(_analyze_file_worker(
+            file_path, self.root_path, self.project_modules, self.cache_dir, self._content_cache, self.max_file_size
+        ))
+
+    def _analyze_files_parallel(self) -> bool:
+        """
+        Analyze all files in a process pool, merging results in file order.
+
+        Returns:
+            False if a process pool is unavailable or pointless (single CPU), True otherwise.
+        """
+        if (os.cpu_count() or 1) < 2:
+            return False
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            return
-        
-        try:
-            tree = ast.parse(content, filename=str(file_path))
-        except SyntaxError:
+            pool = ProcessPoolExecutor(
+                initializer=_init_worker,
+                initargs=(self.root_path, self.project_modules, self.cache_dir, self.max_file_size),
+            )
+        except (ImportError, NotImplementedError, OSError):
+            return False
+
+        with pool:
+            results = pool.map(_run_worker, self.python_files, chunksize=PARALLEL_CHUNKSIZE)
+            for file_path, (result, error) in zip(self.python_files, results):
+                if error is not None:
+                    # Continue analysis even if one file fails
+                    print(f"Warning: Failed to analyze {file_path}: {error}")
+                    continue
+                self._merge_file_analysis(result)
+        return True
+
+    def _merge_file_analysis(self, result: Optional[FileAnalysis]):
+        """Merge one file's analysis into the codebase-wide results."""
+        if result is None:
             return
-        
-        rel_path = str(file_path.relative_to(self.root_path))
-        
-        # Initialize file imports
-        self.analysis.imports[rel_path] = []
-        
-        # Analyze the AST
-        visitor = self.DependencyVisitor(self, rel_path)
-        visitor.visit(tree)
+        self.analysis.imports[result.rel_path] = result.imports
+        self.analysis.classes.update(result.classes)
+        self.analysis.functions.update(result.functions)
     
     def _build_relationships(self):
         """Build cross-file relationships after analyzing all files."""
         # Build file dependencies from imports
         for file_path, imports in self.analysis.imports.items():
-            for import_info in imports:
-                if not import_info.is_external:
-                    self.analysis.file_dependencies[file_path].add(import_info.module)
+            internal_modules = [imp.module for imp in imports if not imp.is_external]
+            if internal_modules:
+                self.analysis.file_dependencies[file_path].update(internal_modules)
         
         # Build inheritance tree
-        for class_key, class_info in self.analysis.classes.items():
+        classes = self.analysis.classes
+        base_index = self._build_base_index()
+        for class_key, class_info in classes.items():
             for base in class_info.bases:
-                # Find the base class in our analysis
-                for other_key, other_class in self.analysis.classes.items():
-                    if other_class.name == base or other_key.endswith(f".{base}"):
-                        self.analysis.inheritance_tree[other_key].append(class_key)
-                        break
-        
-        # Build function call graph with more context
-        for func_key, func_info in self.analysis.functions.items():
-            for call in func_info.calls:
-                # Try to find the called function in our analysis
-                for other_key, other_func in self.analysis.functions.items():
-                    if other_key == func_key:  # Skip self
-                        continue
-                    
-                    # More precise matching:
-                    # 1. Exact name match within same file/class
-                    # 2. Method call on same class (self.method)
-                    # 3. Cross-file function call
-                    same_file = func_info.file_path == other_func.file_path
-                    same_class = func_info.class_name == other_func.class_name
-                    
-                    if (other_func.name == call and same_file and same_class) or \
-                       (other_func.name == call and same_file and not func_info.class_name and not other_func.class_name) or \
-                       (other_key.endswith(f"::{call}") and not same_file):
-                        self.analysis.function_call_graph[func_key].add(other_key)
-                        other_func.called_by.append(func_key)
+                # Find the base class in our analysis, preferring one defined in the same file
+                other_key = f"{class_info.file_path}::{base}"
+                if other_key == class_key or other_key not in classes:
+                    other_key = base_index.get(base)
+                if other_key is not None:
+                    self.analysis.inheritance_tree[other_key].append(class_key)
+        # Sorted once here so formatting never re-sorts a parent's children
+        for children in self.analysis.inheritance_tree.values():
+            children.sort()
+
+        # Build function call graph with more context.
+        # Functions are referred to by definition index here, so "first match" is a plain int compare.
+        func_keys = list(self.analysis.functions)
+        func_infos = list(self.analysis.functions.values())
+        local_index, qualname_index = self._build_function_indexes(func_keys, func_infos)
+        # Most calls target builtins or libraries; drop them in one set intersection
+        resolvable = {name for _, _, name in local_index}
+        resolvable.update(qualname_index)
+        for i, func_info in enumerate(func_infos):
+            file_path = func_info.file_path
+            for call in func_info.calls & resolvable:
+                # More precise matching:
+                # 1. Exact name match within same file/class
+                # 2. Method call on same class (self.method)
+                # 3. Cross-file function call
+                best = local_index.get((file_path, func_info.class_name, call))
+                if best == i:  # Skip self
+                    best = None
+                for j in qualname_index.get(call, ()):
+                    if func_infos[j].file_path != file_path:
+                        # Keep the first match in definition order, like a linear scan would
+                        if best is None or j < best:
+                            best = j
                         break
+                if best is not None:
+                    self.analysis.function_call_graph[func_keys[i]].add(func_keys[best])
+
+        # Reverse edges, derived once from the finished forward graph
+        for caller_key, callee_keys in self.analysis.function_call_graph.items():
+            for callee_key in callee_keys:
+                self.analysis.functions[callee_key].called_by.add(caller_key)
+
+    def _build_base_index(self) -> Dict[str, str]:
+        """
+        Map every name a base class can be referred by to the first matching class key.
+
+        A class matches a base either by its bare name or by any dotted suffix of its key.
+        """
+        index: Dict[str, str] = {}
+        for class_key, class_info in self.analysis.classes.items():
+            index.setdefault(class_info.name, class_key)
+            pos = class_key.find('.')
+            while pos != -1:
+                index.setdefault(class_key[pos + 1:], class_key)
+                pos = class_key.find('.', pos + 1)
+        return index
+
+    @staticmethod
+    def _build_function_indexes(
+        func_keys: List[str], func_infos: List[FunctionInfo]
+    ) -> Tuple[Dict[Tuple[str, Optional[str], str], int], Dict[str, List[int]]]:
+        """
+        Index functions for call resolution, by position in definition order.
+
+        Returns:
+            A (file_path, class_name, name) -> index map for same-file/same-class calls,
+            and a qualified name -> [index, ...] map for cross-file calls.
+        """
+        local_index: Dict[Tuple[str, Optional[str], str], int] = {}
+        qualname_index: Dict[str, List[int]] = defaultdict(list)
+        for i, func_info in enumerate(func_infos):
+            local_index.setdefault((func_info.file_path, func_info.class_name, func_info.name), i)
+            qualname_index[func_keys[i].rpartition('::')[2]].append(i)
+        return local_index, qualname_index
     
     class DependencyVisitor(ast.NodeVisitor):
         """AST visitor to extract dependency information."""
+
+        # Node type -> visit_* method (or None), resolved once per type instead of per node
+        _dispatch: Dict[type, Any] = {}
         
-        def __init__(self, mapper: 'DependencyMapper', file_path: str):
-            self.mapper = mapper
-            self.file_path = file_path
+        def __init__(self, project_modules: Dict[str, bool], result: FileAnalysis):
+            self.project_modules = project_modules
+            self.result = result
+            self.file_path = result.rel_path
             self.current_class: Optional[str] = None
-            self.current_function: Optional[str] = None
+            self.current_function: Optional[FunctionInfo] = None
+
+        def visit(self, node: ast.AST):
+            node_type = type(node)
+            try:
+                method = self._dispatch[node_type]
+            except KeyError:
+                method = getattr(type(self), 'visit_' + node_type.__name__, None)
+                self._dispatch[node_type] = method
+            if method is None:
+                self.generic_visit(node)
+            else:
+                method(self, node)
+
+        def generic_visit(self, node: ast.AST):
+            visit = self.visit
+            if self.current_function is None:
+                # Calls are only recorded inside functions, so skip expressions out here
+                for child in ast.iter_child_nodes(node):
+                    if isinstance(child, _STATEMENT_CONTAINERS):
+                        visit(child)
+            else:
+                for child in ast.iter_child_nodes(node):
+                    visit(child)
         
         def visit_Import(self, node: ast.Import):
             """Handle import statements."""
             for alias in node.names:
+                root_module = alias.name.partition('.')[0]
                 import_info = ImportInfo(
                     module=alias.name,
                     alias=alias.asname,
                     is_from_import=False,
-                    is_external=alias.name not in self.mapper.project_modules,
-                    line_number=node.lineno
+                    is_external=_is_external(alias.name, self.project_modules),
+                    line_number=node.lineno,
+                    root_module=root_module
                 )
-                self.mapper.analysis.imports[self.file_path].append(import_info)
-            self.generic_visit(node)
+                self.result.imports.append(import_info)
+            # Only alias nodes below an import, nothing else to visit
         
         def visit_ImportFrom(self, node: ast.ImportFrom):
             """Handle from...import statements."""
             if node.module:
                 imported_names = [alias.name for alias in node.names]
+                root_module = node.module.partition('.')[0]
                 import_info = ImportInfo(
                     module=node.module,
                     is_from_import=True,
                     imported_names=imported_names,
-                    is_external=node.module not in self.mapper.project_modules,
-                    line_number=node.lineno
+                    is_external=_is_external(node.module, self.project_modules),
+                    line_number=node.lineno,
+                    root_module=root_module
                 )
-                self.mapper.analysis.imports[self.file_path].append(import_info)
-            self.generic_visit(node)
+                self.result.imports.append(import_info)
         
         def visit_ClassDef(self, node: ast.ClassDef):
             """Handle class definitions."""
@@ -223,12 +441,9 @@ class DependencyMapper:
                 if isinstance(base, ast.Name):
                     bases.append(base.id)
                 elif isinstance(base, ast.Attribute):
-                    bases.append(ast.unparse(base))
+                    bases.append(_dotted_name(base) or ast.unparse(base))
             
-            methods = []
-            for item in node.body:
-                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    methods.append(item.name)
+            methods = [item.name for item in node.body if type(item) in _FUNCTION_DEF_TYPES]
             
             class_key = f"{self.file_path}::{node.name}"
             class_info = ClassInfo(
@@ -238,13 +453,13 @@ class DependencyMapper:
                 methods=methods,
                 line_number=node.lineno
             )
-            self.mapper.analysis.classes[class_key] = class_info
+            self.result.classes[class_key] = class_info
             
             # Visit class body with class context
-            old_class = self.current_class
-            self.current_class = node.name
+            old_class, old_function = self.current_class, self.current_function
+            self.current_class, self.current_function = node.name, None
             self.generic_visit(node)
-            self.current_class = old_class
+            self.current_class, self.current_function = old_class, old_function
         
         def visit_FunctionDef(self, node: ast.FunctionDef):
             """Handle function definitions."""
@@ -266,27 +481,229 @@ class DependencyMapper:
                 class_name=self.current_class
             )
             
-            # Find function calls in the body
+            self.result.functions[func_key] = function_info
+
+            # Decorators, defaults and annotations are evaluated in the enclosing scope
+            for decorator in node.decorator_list:
+                self.visit(decorator)
+            self.visit(node.args)
+            if node.returns is not None:
+                self.visit(node.returns)
+
+            # Calls in the body are collected by visit_Call; nested functions own their calls
             old_function = self.current_function
-            self.current_function = node.name
-            
-            for child in ast.walk(node):
-                if isinstance(child, ast.Call):
-                    if isinstance(child.func, ast.Name):
-                        function_info.calls.append(child.func.id)
-                    elif isinstance(child.func, ast.Attribute):
-                        if isinstance(child.func.value, ast.Name):
-                            if child.func.value.id == 'self' and self.current_class:
-                                function_info.calls.append(child.func.attr)
-                            else:
-                                function_info.calls.append(f"{child.func.value.id}.{child.func.attr}")
-            
-            self.mapper.analysis.functions[func_key] = function_info
+            self.current_function = function_info
+            for stmt in node.body:
+                self.visit(stmt)
             self.current_function = old_function
-            
+
+        def visit_Call(self, node: ast.Call):
+            """Record a call against the innermost enclosing function."""
+            if self.current_function is not None:
+                calls = self.current_function.calls
+                func = node.func
+                # ast node classes are never subclassed, so identity compares are enough
+                func_type = type(func)
+                if func_type is ast.Name:
+                    calls.add(func.id)
+                elif func_type is ast.Attribute:
+                    value = func.value
+                    if type(value) is ast.Name and value.id == 'self' and self.current_class:
+                        calls.add(func.attr)
+                    else:
+                        dotted = _dotted_name(func)
+                        if dotted:
+                            calls.add(dotted)
             self.generic_visit(node)
 
 
+def _dotted_name(node: ast.expr) -> Optional[str]:
+    """
+    Return the dotted name for a Name/Attribute chain such as ``a.b.c``.
+
+    Returns:
+        The dotted name, or None if the chain is not rooted at a plain name (e.g. ``f().x``).
+    """
+    parts = []
+    while type(node) is ast.Attribute:
+        parts.append(node.attr)
+        node = node.value
+    if type(node) is not ast.Name:
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def _analyze_file_worker(
+    file_path: Path,
+    root_path: Path,
+    project_modules: Dict[str, bool],
+    cache_dir: Optional[Path] = None,
+    content_cache: Optional[Dict[bytes, Optional[FileAnalysis]]] = None,
+    max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+) -> Optional[FileAnalysis]:
+    """
+    Parse and visit a single Python file, reusing a cached result if the file is unchanged.
+
+    Files whose content was already analyzed, in this run (per content_cache) or an earlier
+    one (per the on-disk cache), are not re-parsed; the earlier result is copied over to the new path.
+
+    Returns:
+        FileAnalysis for the file, or None if it cannot be decoded or parsed,
+        has no imports or definitions, is larger than max_file_size, or is
+        marked as generated code.
+    """
+    st = os.stat(file_path)
+    if max_file_size is not None and st.st_size > max_file_size:
+        return None
+
+    cache_path = None
+    if cache_dir:
+        # Keyed by path, root, mtime and size: no need to read unchanged files at all
+        cache_path = cache.entry_path(
+            cache_dir, *_CACHE_KEY, os.path.abspath(file_path), root_path, st.st_mtime_ns, st.st_size
+        )
+    if cache_path:
+        result = _load_cached(cache_path, project_modules)
+        if result is not None:
+            return result
+
+    # ast.parse decodes bytes itself, honouring BOMs and coding declarations
+    content = file_path.read_bytes()
+    if _GENERATED_HEADER_RE.match(content, 0, 2048):
+        return None
+    rel_path = str(file_path.relative_to(root_path))
+
+    digest = None
+    if content_cache is not None or cache_dir:
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+    if content_cache is not None and digest in content_cache:
+        duplicate = content_cache[digest]
+        return _relocate_file_analysis(duplicate, rel_path) if duplicate is not None else None
+
+    content_path = None
+    if cache_dir:
+        # Touched, renamed or freshly checked out files still match on content
+        content_path = cache.entry_path(cache_dir, *_CACHE_KEY, 'content', digest.hex())
+        result = _load_cached(content_path, project_modules)
+        if result is not None:
+            if result.rel_path != rel_path:
+                result = _relocate_file_analysis(result, rel_path)
+            if content_cache is not None:
+                content_cache[digest] = result
+            cache.store(cache_path, result)
+            return result
+
+    result = None
+    if _SOURCE_TOKENS_RE.search(content):
+        try:
+            tree = _parse_source(content, str(file_path))
+            result = FileAnalysis(rel_path=rel_path)
+            DependencyMapper.DependencyVisitor(project_modules, result).visit(tree)
+        except (SyntaxError, ValueError):  # ValueError: null bytes on Python < 3.12
+            result = None
+    if content_cache is not None:
+        content_cache[digest] = result
+    if result is None:
+        return None
+
+    if cache_path:
+        cache.store(cache_path, result)
+        cache.store(content_path, result)
+    return result
+
+
+def _parse_source(content: bytes, filename: str) -> ast.Module:
+    """Parse source bytes to an AST; compile() directly skips ast.parse's wrapper."""
+    return compile(content, filename, 'exec', ast.PyCF_ONLY_AST, dont_inherit=True)
+
+
+def _relocate_file_analysis(result: FileAnalysis, rel_path: str) -> FileAnalysis:
+    """Copy a FileAnalysis for an identical file at rel_path, rewriting paths and keys."""
+    old_prefix = len(result.rel_path)
+    return FileAnalysis(
+        rel_path=rel_path,
+        imports=[replace(imp) for imp in result.imports],
+        classes={
+            rel_path + key[old_prefix:]: replace(info, file_path=rel_path)
+            for key, info in result.classes.items()
+        },
+        functions={
+            rel_path + key[old_prefix:]: replace(info, file_path=rel_path, calls=set(info.calls), called_by=set())
+            for key, info in result.functions.items()
+        },
+    )
+
+
+def _is_external(module: str, project_modules: Dict[str, bool]) -> bool:
+    """Whether a dotted import path lies outside the project."""
+    # Back off to the longest prefix the project defines. Names past a plain module are attributes
+    # of it, but a name past a package has to be a submodule, and the project doesn't have that one
+    name = module
+    while True:
+        is_package = project_modules.get(name)
+        if is_package is not None:
+            return is_package and name != module
+        pos = name.rfind('.')
+        if pos == -1:
+            return True
+        name = name[:pos]
+
+
+def _load_cached(cache_path: Path, project_modules: Dict[str, bool]) -> Optional[FileAnalysis]:
+    """Load a cached FileAnalysis, or None on a miss or unreadable entry."""
+    result = cache.load(cache_path)
+    if not isinstance(result, FileAnalysis):
+        return None
+
+    # Internal/external depends on which files are part of this run, not on the file itself
+    for import_info in result.imports:
+        import_info.is_external = _is_external(import_info.module, project_modules)
+    return result
+
+
+# Per-process state for pool workers, set once by _init_worker
+_worker_root_path: Optional[Path] = None
+_worker_project_modules: Dict[str, bool] = {}
+_worker_cache_dir: Optional[Path] = None
+_worker_max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE
+_worker_content_cache: Dict[bytes, Optional[FileAnalysis]] = {}
+
+
+def _init_worker(
+    root_path: Path,
+    project_modules: Dict[str, bool],
+    cache_dir: Optional[Path],
+    max_file_size: Optional[int],
+):
+    """Process pool initializer: ship shared state to each worker once."""
+    global _worker_root_path, _worker_project_modules, _worker_cache_dir, _worker_max_file_size
+    _worker_root_path = root_path
+    _worker_project_modules = project_modules
+    _worker_cache_dir = cache_dir
+    _worker_max_file_size = max_file_size
+
+
+def _run_worker(file_path: Path) -> Tuple[Optional[FileAnalysis], Optional[str]]:
+    """
+    Process pool task: analyze one file with the worker's shared state.
+
+    Errors are returned rather than raised, so one bad file cannot abort a chunked map.
+    """
+    try:
+        result = _analyze_file_worker(
+            file_path,
+            _worker_root_path,
+            _worker_project_modules,
+            _worker_cache_dir,
+            _worker_content_cache,
+            _worker_max_file_size,
+        )
+    except Exception as e:
+        return None, str(e)
+    return result, None
+
+
 def format_dependency_analysis(analysis: DependencyAnalysis, focus: Optional[str] = None) -> str:
     """
     Format dependency analysis results into LLM-friendly text.
@@ -298,143 +715,173 @@ def format_dependency_analysis(analysis: DependencyAnalysis, focus: Optional[str
     Returns:
         Formatted string suitable for LLM prompts
     """
-    output = []
-    
-    if not focus or focus == 'imports':
-        output.append("## 📦 Import Dependencies\n")
-        
-        # Group and deduplicate imports
-        for file_path, imports in sorted(analysis.imports.items()):
-            if not imports:
-                continue
-                
-            internal_modules = set()
-            external_modules = set()
-            
-            for imp in imports:
-                if imp.is_external:
-                    external_modules.add(imp.module.split('.')[0])  # Use root module only
-                else:
-                    internal_modules.add(imp.module)
-            
-            if internal_modules or external_modules:
-                output.append(f"**{file_path}**")
-                
-                if internal_modules:
-                    internal_list = ", ".join(sorted(internal_modules))
-                    output.append(f"  Internal: {internal_list}")
-                
-                if external_modules:
-                    external_list = ", ".join(sorted(external_modules))
-                    output.append(f"  External: {external_list}")
-                
-                output.append("")
-    
-    if not focus or focus == 'inheritance':
-        output.append("## 🏗️ Class Inheritance Hierarchy\n")
-        
-        # Find root classes (classes with no parents in our codebase)
-        all_children = set()
-        for children in analysis.inheritance_tree.values():
-            all_children.update(children)
-        
-        root_classes = []
-        for class_key, class_info in analysis.classes.items():
-            if class_key not in all_children:
-                root_classes.append(class_key)
-        
-        def format_inheritance_tree(class_key: str, level: int = 0) -> List[str]:
-            """Recursively format inheritance tree."""
-            lines = []
-            if class_key in analysis.classes:
-                class_info = analysis.classes[class_key]
-                indent = "  " * level
-                connector = "├── " if level > 0 else ""
-                
-                bases_str = ""
-                if class_info.bases:
-                    bases_str = f" extends {', '.join(class_info.bases)}"
-                
-                lines.append(f"{indent}{connector}**{class_info.name}** ({class_info.file_path}){bases_str}")
-                
-                # Add methods if any
-                if class_info.methods:
-                    method_list = ", ".join(class_info.methods[:5])
-                    if len(class_info.methods) > 5:
-                        method_list += "..."
-                    lines.append(f"{indent}    Methods: {method_list}")
-                
-                # Add children
-                children = analysis.inheritance_tree.get(class_key, [])
-                for child in sorted(children):
-                    lines.extend(format_inheritance_tree(child, level + 1))
-            
-            return lines
-        
-        if root_classes:
-            for root in sorted(root_classes):
-                output.extend(format_inheritance_tree(root))
-                output.append("")
-        else:
-            output.append("No class inheritance relationships found.\n")
-    
-    if not focus or focus == 'calls':
-        output.append("## 🔄 Function Call Relationships\n")
-        
-        # Build a clean call graph by grouping by file and removing duplicates
-        call_graph = {}
-        
-        for func_key, func_info in analysis.functions.items():
-            calls = analysis.function_call_graph.get(func_key, set())
-            if calls:
-                file_path = func_info.file_path
-                if file_path not in call_graph:
-                    call_graph[file_path] = []
-                
-                class_prefix = f"{func_info.class_name}." if func_info.class_name else ""
-                caller_name = f"{class_prefix}{func_info.name}()"
-                
-                # Get unique called functions
-                called_functions = []
-                for called_func_key in sorted(calls):
-                    if called_func_key in analysis.functions:
-                        called_func = analysis.functions[called_func_key]
-                        called_class_prefix = f"{called_func.class_name}." if called_func.class_name else ""
-                        called_name = f"{called_class_prefix}{called_func.name}()"
-                        called_file = called_func.file_path
-                        
-                        # Format based on whether it's same file or cross-file
-                        if called_file == file_path:
-                            called_functions.append(called_name)
-                        else:
-                            called_functions.append(f"{called_name} [{called_file}]")
-                
-                if called_functions:
-                    call_graph[file_path].append(f"{caller_name} → {', '.join(called_functions)}")
-        
-        if call_graph:
-            for file_path in sorted(call_graph.keys()):
-                output.append(f"**{file_path}**:")
-                for call_relationship in call_graph[file_path]:
-                    output.append(f"  - {call_relationship}")
-                output.append("")
-        else:
-            output.append("No function call relationships found.\n")
-    
-    # Add summary statistics
-    output.append("## 📊 Summary Statistics\n")
-    total_files = len([f for f in analysis.imports.keys() if analysis.imports[f]])
-    total_classes = len(analysis.classes)
-    total_functions = len(analysis.functions)
-    external_deps = set()
-    for imports in analysis.imports.values():
+    buf = io.StringIO()
+
+    if not focus:
+        sections = _SECTION_FORMATTERS.values()
+    else:
+        sections = [_SECTION_FORMATTERS[focus]] if focus in _SECTION_FORMATTERS else []
+    for format_section in sections:
+        format_section(analysis, buf)
+
+    _format_summary(analysis, buf)
+    return buf.getvalue()
+
+
+def _format_imports(analysis: DependencyAnalysis, buf: io.StringIO):
+    """Write the per-file internal/external import section."""
+    w = buf.write
+    w("## 📦 Import Dependencies\n\n")
+
+    # Group and deduplicate imports
+    for file_path, imports in sorted(analysis.imports.items()):
+        if not imports:
+            continue
+
+        internal_modules = set()
+        external_modules = set()
+
         for imp in imports:
             if imp.is_external:
-                external_deps.add(imp.module.split('.')[0])  # Get root module name
-    
-    output.append(f"- **Files analyzed**: {total_files}")
-    output.append(f"- **Classes found**: {total_classes}")
-    output.append(f"- **Functions found**: {total_functions}")
-    output.append(f"- **External dependencies**: {len(external_deps)} ({', '.join(sorted(list(external_deps))[:10])}{'...' if len(external_deps) > 10 else ''})")
-    
-    return "\n".join(output)
\ No newline at end of file
+                external_modules.add(imp.root_module)  # Use root module only
+            else:
+                internal_modules.add(imp.module)
+
+        if internal_modules or external_modules:
+            internal_line = f"  Internal: {', '.join(sorted(internal_modules))}\n" if internal_modules else ""
+            external_line = f"  External: {', '.join(sorted(external_modules))}\n" if external_modules else ""
+            w(f"**{file_path}**\n{internal_line}{external_line}\n")
+
+
+def _format_inheritance(analysis: DependencyAnalysis, buf: io.StringIO):
+    """Write the class inheritance hierarchy section."""
+    w = buf.write
+    w("## 🏗️ Class Inheritance Hierarchy\n\n")
+
+    classes = analysis.classes
+    inheritance_tree = analysis.inheritance_tree
+
+    # Find root classes (classes with no parents in our codebase)
+    all_children = set()
+    for children in inheritance_tree.values():
+        all_children.update(children)
+    root_classes = [class_key for class_key in classes if class_key not in all_children]
+
+    if root_classes:
+        for root in sorted(root_classes):
+            _format_inheritance_tree(analysis, root, buf)
+            w("\n")
+    else:
+        w("No class inheritance relationships found.\n\n")
+
+
+def _format_inheritance_tree(analysis: DependencyAnalysis, root_key: str, buf: io.StringIO):
+    """Write the inheritance tree under root_key, depth-first."""
+    w = buf.write
+    classes = analysis.classes
+    inheritance_tree = analysis.inheritance_tree
+
+    stack = [(root_key, 0)]
+    path: List[str] = []  # ancestors of the entry being written, to break cycles
+    while stack:
+        class_key, level = stack.pop()
+        del path[level:]
+        class_info = classes.get(class_key)
+        if class_info is None or class_key in path:
+            continue
+        path.append(class_key)
+
+        indent = "  " * level
+        connector = "├── " if level > 0 else ""
+
+        bases_str = ""
+        if class_info.bases:
+            bases_str = f" extends {', '.join(class_info.bases)}"
+
+        w(f"{indent}{connector}**{class_info.name}** ({class_info.file_path}){bases_str}\n")
+
+        # Add methods if any
+        if class_info.methods:
+            method_list = ", ".join(class_info.methods[:5])
+            if len(class_info.methods) > 5:
+                method_list += "..."
+            w(f"{indent}    Methods: {method_list}\n")
+
+        # Add children (kept sorted by _build_relationships), reversed so they pop in order
+        children = inheritance_tree.get(class_key)
+        if children:
+            stack.extend([(child, level + 1) for child in reversed(children)])
+
+
+def _format_calls(analysis: DependencyAnalysis, buf: io.StringIO):
+    """Write the function call relationships section, grouped by file."""
+    w = buf.write
+    w("## 🔄 Function Call Relationships\n\n")
+
+    # Build a clean call graph by grouping by file and removing duplicates
+    call_graph = {}
+    display_names: Dict[str, str] = {}  # func_key -> "Class.name()", rendered once per function
+
+    def display_name(func_key: str) -> str:
+        name = display_names.get(func_key)
+        if name is None:
+            func = analysis.functions[func_key]
+            class_prefix = f"{func.class_name}." if func.class_name else ""
+            name = display_names[func_key] = f"{class_prefix}{func.name}()"
+        return name
+
+    # Only callers with resolved calls are in the graph; no need to scan every function
+    for func_key, calls in analysis.function_call_graph.items():
+        func_info = analysis.functions.get(func_key)
+        if calls and func_info is not None:
+            file_path = func_info.file_path
+            if file_path not in call_graph:
+                call_graph[file_path] = []
+
+            caller_name = display_name(func_key)
+
+            # Get unique called functions
+            called_functions = []
+            for called_func_key in sorted(calls):
+                if called_func_key in analysis.functions:
+                    called_name = display_name(called_func_key)
+                    called_file = analysis.functions[called_func_key].file_path
+
+                    # Format based on whether it's same file or cross-file
+                    if called_file == file_path:
+                        called_functions.append(called_name)
+                    else:
+                        called_functions.append(f"{called_name} [{called_file}]")
+
+            if called_functions:
+                call_graph[file_path].append(f"{caller_name} → {', '.join(called_functions)}")
+
+    if call_graph:
+        for file_path in sorted(call_graph.keys()):
+            relationships = "".join(f"  - {call_relationship}\n" for call_relationship in call_graph[file_path])
+            w(f"**{file_path}**:\n{relationships}\n")
+    else:
+        w("No function call relationships found.\n\n")
+
+
+def _format_summary(analysis: DependencyAnalysis, buf: io.StringIO):
+    """Write the summary statistics section (always included)."""
+    w = buf.write
+    w("## 📊 Summary Statistics\n\n")
+    total_files = sum(1 for imports in analysis.imports.values() if imports)
+    total_classes = len(analysis.classes)
+    total_functions = len(analysis.functions)
+    external_deps = {imp.root_module for imports in analysis.imports.values() for imp in imports if imp.is_external}
+
+    w(f"- **Files analyzed**: {total_files}\n")
+    w(f"- **Classes found**: {total_classes}\n")
+    w(f"- **Functions found**: {total_functions}\n")
+    w(f"- **External dependencies**: {len(external_deps)} ({', '.join(sorted(list(external_deps))[:10])}{'...' if len(external_deps) > 10 else ''})")
+
+
+# Optional report sections, in output order, keyed by --map-dependencies focus
+_SECTION_FORMATTERS = {
+    'imports': _format_imports,
+    'inheritance': _format_inheritance,
+    'calls': _format_calls,
+}
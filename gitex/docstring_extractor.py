@@ -1,24 +1,96 @@
 import ast
+import hashlib
+import io
+import sys
+import tokenize
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 
-def extract_docstrings(file_path: Path, symbol_path: Optional[str] = None, include_empty_classes: bool = False) -> str:
+from gitex import __version__, cache
+
+# Bump whenever the rendered output changes, to invalidate old cache entries
+CACHE_FORMAT = 3
+
+def extract_docstrings(file_path: Path, symbol_path: Optional[str] = None, include_empty_classes: bool = False,
+                       use_cache: bool = False) -> str:
     """
     Extracts module, class, and function docstrings and signatures from a Python file,
     preserving the code structure. If a symbol_path is provided, it extracts
     documentation only for that specific symbol.
+
+    With use_cache, results are cached on disk keyed by the file's content hash,
+    so unchanged files are not parsed again on later runs.
     """
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-    except UnicodeDecodeError:
-        return f"Could not decode file: {file_path}\n"
+    # Parsed as bytes: the tokenizer decodes (honouring PEP 263 declarations), no separate str copy
+    content = Path(file_path).read_bytes()
+
+    cache_path = None
+    if use_cache:
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        # Rendering can change between releases, and ast.unparse output between interpreter
+        # versions, so each gets separate entries
+        cache_path = cache.entry_path(
+            cache.cache_dir("docstrings"), CACHE_FORMAT, __version__, sys.version_info[:2], digest,
+            file_path, symbol_path, include_empty_classes,
+        )
+        cached = cache.load(cache_path)
+        if isinstance(cached, str):
+            return cached
 
     try:
         tree = ast.parse(content, filename=str(file_path))
-    except SyntaxError as e:
+    except (SyntaxError, ValueError) as e:
+        if not _is_decodable(content):
+            return f"Could not decode file: {file_path}\n"
         return f"Could not parse file: {file_path} (SyntaxError: {e})\n"
 
+    result = _render_docstrings(tree, file_path, symbol_path, include_empty_classes)
+    if cache_path is not None:
+        cache.store(cache_path, result)
+    return result
+
+
+def _is_decodable(content: bytes) -> bool:
+    """Checks whether source bytes decode with their declared (or default UTF-8) encoding."""
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+        content.decode(encoding)
+    except (SyntaxError, LookupError, UnicodeDecodeError):
+        return False
+    return True
+
+
+def _unparse(node: ast.AST) -> str:
+    """ast.unparse, short-circuited for plain and dotted names (most bases, decorators and annotations)."""
+    parts = []
+    current = node
+    while type(current) is ast.Attribute:
+        parts.append(current.attr)
+        current = current.value
+    if type(current) is not ast.Name:
+        return ast.unparse(node)
+    parts.append(current.id)
+    return ".".join(reversed(parts))
+
+
+def _index_symbols(tree: ast.Module) -> Dict[str, ast.AST]:
+    """Maps each dotted class/function name (e.g. "Class.method") to its first definition."""
+    index: Dict[str, ast.AST] = {}
+    stack = [("", tree.body)]
+    while stack:
+        prefix, body = stack.pop()
+        for node in body:
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                name = f"{prefix}{node.name}"
+                if name not in index:
+                    index[name] = node
+                    stack.append((f"{name}.", node.body))
+    return index
+
+
+def _render_docstrings(tree: ast.Module, file_path: Path, symbol_path: Optional[str],
+                       include_empty_classes: bool) -> str:
+    """Renders the docstrings and signatures of a parsed module (see extract_docstrings)."""
     output = []
 
     def _process_node(node, indent_level=0, is_target_node=False):
@@ -34,32 +106,32 @@ def extract_docstrings(file_path: Path, symbol_path: Optional[str] = None, inclu
                  if not is_target_node:
                     return
 
-            decorator_list = [f"@{ast.unparse(d)}" for d in node.decorator_list]
+            decorator_list = [f"@{_unparse(d)}" for d in node.decorator_list]
             
             if decorator_list:
                 output.append(f"{indent}" + f"\n{indent}".join(decorator_list))
 
+            docstring = ast.get_docstring(node)
+            if not docstring and not include_empty_classes:
+                # No signature if no docstring and not including empty classes, so don't format one
+                return
+
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 args_str = ast.unparse(node.args).replace('=', ' = ')
                 args_str = ' '.join(args_str.split())
-                return_type = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+                return_type = f" -> {_unparse(node.returns)}" if node.returns else ""
                 signature = f"def {node.name}({args_str}){return_type}:"
                 output.append(f"{indent}{signature}")
             else: # ClassDef
                 signature = f"class {node.name}"
                 if node.bases:
-                    bases = ", ".join(ast.unparse(b) for b in node.bases)
+                    bases = ", ".join(_unparse(b) for b in node.bases)
                     signature += f"({bases})"
                 signature += ":"
                 output.append(f"{indent}{signature}")
 
-            docstring = ast.get_docstring(node)
             if docstring:
                 output.append(f'{indent}    """{docstring}"""')
-            elif not include_empty_classes:
-                # Remove the signature we just added if no docstring and not including empty classes
-                output.pop()
-                return
 
             # If it's a class, process its body
             if isinstance(node, ast.ClassDef):
@@ -82,27 +154,18 @@ def extract_docstrings(file_path: Path, symbol_path: Optional[str] = None, inclu
         file_path_part = ""
         for i in range(len(path_parts), 0, -1):
             potential_path = "/".join(path_parts[:i]) + ".py"
-            if str(file_path).endswith(potential_path):
+            if Path(file_path).as_posix().endswith(potential_path):
                 file_path_part = ".".join(path_parts[:i])
                 break
         
         symbol_name_parts = symbol_path[len(file_path_part):].lstrip('.').split('.')
-
-        current_nodes = tree.body
+        names = [part for part in symbol_name_parts if part]
+        index = _index_symbols(tree)
+        # Leading parts that are not symbols of this file (e.g. a package path that didn't
+        # match file_path) are skipped: try the longest suffix that names a symbol
         target_node = None
-
-        for i, part in enumerate(symbol_name_parts):
-            if not part: continue
-            found_node = None
-            for node in current_nodes:
-                if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == part:
-                    if i == len(symbol_name_parts) - 1:
-                        target_node = node
-                        break
-                    else:
-                        found_node = node
-                        current_nodes = node.body
-                        break
+        for i in range(len(names)):
+            target_node = index.get(".".join(names[i:]))
             if target_node:
                 break
         
@@ -0,0 +1,60 @@
+# listing_cache.py
+"""
+Directory listings cached across runs.
+
+Each picked root has one cache entry mapping directory paths to (mtime_ns, listing).
+A directory's mtime changes whenever an entry is added, removed or renamed, so a
+listing whose mtime still matches is reused after a single stat() instead of a rescan.
+"""
+from __future__ import annotations
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from gitex import cache
+
+# Bump when the layout of cached listings changes
+CACHE_FORMAT = 1
+
+# Listings modified this recently are not cached: another change within the same
+# mtime tick would leave the mtime untouched and go unnoticed
+_RACY_WINDOW_NS = 2_000_000_000
+
+Listing = List[Tuple[str, Optional[bool]]]
+
+
+def scan_dir(path: str) -> Listing:
+    """
+    Return the sorted (name, is_dir) entries of a directory.
+    is_dir is None for symlinks, whose target can change without touching the directory.
+    """
+    with os.scandir(path) as it:
+        return sorted((entry.name, None if entry.is_symlink() else entry.is_dir()) for entry in it)
+
+
+class ListingCache:
+    """Listings of the directories under one root, loaded once and saved after the walk."""
+
+    def __init__(self, root_path: str):
+        self._path = cache.entry_path(cache.cache_dir("listings"), CACHE_FORMAT, os.path.abspath(root_path))
+        self._cached: Dict[str, Tuple[int, Listing]] = cache.load(self._path) or {}
+        # Only directories seen in this walk are kept, so removed ones drop out
+        self._seen: Dict[str, Tuple[int, Listing]] = {}
+        self._changed = False
+
+    def list_dir(self, path: str) -> Listing:
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = self._cached.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            self._seen[path] = cached
+            return cached[1]
+
+        listing = scan_dir(path)
+        if time.time_ns() - mtime_ns > _RACY_WINDOW_NS:
+            self._seen[path] = (mtime_ns, listing)
+            self._changed = True
+        return listing
+
+    def save(self) -> None:
+        if self._changed or len(self._seen) != len(self._cached):
+            cache.store(self._path, self._seen)
@@ -1,33 +1,86 @@
 # main.py
-from fnmatch import fnmatch
+import os
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
 import click
 import git
 from git.exc import InvalidGitRepositoryError
 
 from gitex.picker.base import DefaultPicker
-from gitex.picker.textuals import TextualPicker
+from gitex.picker.gitfiles import GitPicker
 from gitex.renderer import Renderer
 from gitex.docstring_extractor import extract_docstrings
 from gitex.dependency_mapper import DependencyMapper, format_dependency_analysis
 from gitex.utils import copy_to_clipboard
 
-# Patterns to exclude from rendering
-EXCLUDE_PATTERNS = [".git", "*.egg-info", "__pycache__"]
+# Patterns to exclude from rendering; the pickers skip matching names without walking into them
+EXCLUDE_PATTERNS = (".git", "*.egg-info", "__pycache__")
+
+
+def _collect_python_files(nodes) -> List[str]:
+    """Return the paths of the .py files in the tree, in tree order."""
+    python_files = []
+    stack = [iter(nodes)]
+    while stack:
+        # The for loop resumes each level's iterator; break descends, else finishes the level
+        for node in stack[-1]:
+            if node.node_type == "file" and node.name.endswith(".py"):
+                python_files.append(node.path)
+            if node.children:
+                stack.append(iter(node.children))
+                break
+        else:
+            stack.pop()
+    return python_files
+
+
+def _interleave(items: Iterable[str], sep: str) -> Iterator[str]:
+    """Yield items with sep between them: the streamed form of sep.join(items)."""
+    first = True
+    for item in items:
+        if not first:
+            yield sep
+        first = False
+        yield item
+
+
+def _render_output(
+    renderer: Renderer,
+    root: str,
+    no_files: bool,
+    base_dir: str,
+    extract_symbol: Optional[str],
+    include_empty_classes: bool,
+    dependency_focus: Optional[str],
+    use_cache: bool = False,
+) -> Iterator[str]:
+    """Yield the CLI output in order, one chunk at a time."""
+    # Always render tree first, wrapped in triple quotes
+    yield '"""\n'
+    yield from _interleave(renderer.iter_tree(), "\n")
+    yield '\n"""'
 
+    # Handle dependency mapping (works independently of --no-files)
+    if dependency_focus:
+        yield "\n\n### Dependency & Relationship Map ###\n"
 
-def _filter_nodes(nodes):
-    """
-    Recursively filter out FileNode instances matching EXCLUDE_PATTERNS.
-    """
-    filtered = []
-    for node in nodes:
-        if any(fnmatch(node.name, pat) for pat in EXCLUDE_PATTERNS):
-            continue
-        if node.children:
-            node.children = _filter_nodes(node.children)
-        filtered.append(node)
-    return filtered
+        # Analyze dependencies
+        mapper = DependencyMapper(root, use_cache=use_cache)
+        analysis = mapper.analyze(_collect_python_files(renderer.nodes))
+
+        # Format and display results
+        focus_value = None if dependency_focus == "all" else dependency_focus
+        yield format_dependency_analysis(analysis, focus_value)
+
+    elif not no_files:
+        # Render file contents using the filtered nodes
+        if extract_symbol:
+            yield "\n\n### Extracted Docstrings and Signatures ###\n"
+            symbol_target = None if extract_symbol == "*" else extract_symbol
+            yield renderer.render_docstrings(base_dir, symbol_target, include_empty_classes, use_cache)
+        else:
+            yield "\n\n### File Contents ###\n"
+            yield from _interleave(renderer.iter_files(base_dir), "\n\n")
 
 
 @click.command(context_settings=dict(help_option_names=["-h", "--help"]))
@@ -69,6 +122,14 @@ def _filter_nodes(nodes):
 @click.option("-g", "--ignore-gitignore", is_flag=True, help="Include files normally ignored by .gitignore.")
 @click.option("-a", "--all", "show_hidden", is_flag=True, help="Include hidden files (files starting with .).")
 @click.option("--force", is_flag=True, help="Force execution on non-git directories (caution: may be slow).")
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Read directories and files with this many threads (helps on slow or network filesystems).",
+)
+@click.option("--no-cache", is_flag=True, help="Don't read or write the on-disk cache in ~/.cache/gitex.")
 
 # ✅ NEW: internal wrapper mode (hidden)
 @click.option(
@@ -89,6 +150,8 @@ def cli(
     ignore_gitignore,
     show_hidden,
     force,
+    jobs,
+    no_cache,
     emit,  # ✅ NEW
 ):
     """
@@ -102,21 +165,21 @@ def cli(
     - Interactive file selection
     - Gitignore-aware filtering
     """
-    root = Path(path).resolve()
+    root = str(Path(path).resolve())
 
     # Safety Check: Ensure we are in a git repository to prevent accidental massive scans (like ~)
     # The --force flag allows bypassing this check for intentional non-git directory scanning.
+    in_git_repo = True
     try:
-        git.Repo(str(root), search_parent_directories=True)
+        git.Repo(root, search_parent_directories=True)
     except InvalidGitRepositoryError:
+        in_git_repo = False
         if not force:
             click.secho(f"⚠️  Skipping: '{root}' is not a valid Git repository.", fg="yellow", err=True)
             click.secho("   gitex defaults to Git repositories to prevent scanning huge directories (like $HOME).", err=True)
             click.secho("   To force scanning this directory anyway, use: gitex --force ...", dim=True, err=True)
             return
 
-    out_parts = []
-
     # Choose picker strategy
     respect_gitignore = not ignore_gitignore
 
@@ -124,66 +187,45 @@ def cli(
     ignore_hidden = not show_hidden
 
     if interactive:
-        picker = TextualPicker(ignore_hidden=ignore_hidden, respect_gitignore=respect_gitignore)
+        # Textual takes longer to import than a whole non-interactive run, so only load it here
+        from gitex.picker.textuals import TextualPicker
+        picker = TextualPicker(
+            ignore_hidden=ignore_hidden, respect_gitignore=respect_gitignore, exclude_patterns=EXCLUDE_PATTERNS
+        )
+    elif in_git_repo and respect_gitignore and os.path.isdir(root):
+        # Git already knows which files are tracked or ignored; no need to walk and match everything.
+        # A single file PATH goes through DefaultPicker, which renders just that file
+        picker = GitPicker(
+            ignore_hidden=ignore_hidden, exclude_patterns=EXCLUDE_PATTERNS, use_cache=not no_cache, max_workers=jobs
+        )
     else:
-        picker = DefaultPicker(ignore_hidden=ignore_hidden, respect_gitignore=respect_gitignore)
-
-    # Build FileNode hierarchy
-    raw_nodes = picker.pick(str(root))
-
-    # Apply exclusion filters
-    nodes = _filter_nodes(raw_nodes)
-
-    # Always render tree first
-    renderer = Renderer(nodes)
-
-    # Wrap the rendered tree in triple quotes
-    out_parts.append(f'"""\n{renderer.render_tree()}\n"""')
-
-    # Handle dependency mapping (works independently of --no-files)
-    if dependency_focus:
-        out_parts.append("\n\n### Dependency & Relationship Map ###\n")
-
-        # Get Python files from the selected nodes
-        python_files = []
-
-        def collect_python_files(nodes_):
-            for node in nodes_:
-                if node.node_type == "file" and node.name.endswith(".py"):
-                    python_files.append(node.path)
-                if node.children:
-                    collect_python_files(node.children)
-
-        collect_python_files(nodes)
-
-        # Analyze dependencies
-        mapper = DependencyMapper(str(root))
-        analysis = mapper.analyze(python_files)
+        picker = DefaultPicker(
+            ignore_hidden=ignore_hidden,
+            respect_gitignore=respect_gitignore,
+            exclude_patterns=EXCLUDE_PATTERNS,
+            use_cache=not no_cache,
+            max_workers=jobs,
+        )
 
-        # Format and display results
-        focus_value = None if dependency_focus == "all" else dependency_focus
-        formatted_output = format_dependency_analysis(analysis, focus_value)
-        out_parts.append(formatted_output)
+    # Build FileNode hierarchy; excluded patterns are already pruned by the picker
+    nodes = picker.pick(root)
 
-    elif not no_files:
-        # Render file contents using the filtered nodes
-        if extract_symbol:
-            out_parts.append("\n\n### Extracted Docstrings and Signatures ###\n")
-            symbol_target = None if extract_symbol == "*" else extract_symbol
-            out_parts.append(
-                renderer.render_docstrings(base_dir or str(root), symbol_target, include_empty_classes)
-            )
-        else:
-            out_parts.append("\n\n### File Contents ###\n")
-            out_parts.append(renderer.render_files(base_dir or str(root)))
-
-    final_output = "".join(out_parts)
+    renderer = Renderer(nodes, max_workers=jobs)
+    chunks = _render_output(
+        renderer, root, no_files, base_dir or root, extract_symbol, include_empty_classes, dependency_focus,
+        use_cache=not no_cache,
+    )
 
     # ✅ NEW: wrapper mode: print only the output, no clipboard, no status lines
     if emit:
-        click.echo(final_output)
+        # Streamed, so file contents are printed as they are read instead of held until the end
+        for chunk in chunks:
+            click.echo(chunk, nl=False)
+        click.echo()
         return
 
+    final_output = "".join(chunks)
+
     # Normal behavior (pip install / normal execution)
     ok = copy_to_clipboard(final_output)
     if ok:
@@ -1,11 +1,12 @@
 """
 where we store the 
-pydantic Data Structure class
+Data Structure classes
 for our project
 
 """
 
-from pydantic import BaseModel, ConfigDict
+import sys
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -13,13 +14,20 @@ class NodeType(str, Enum):
     FILE = "file"
     DIRECTORY = "directory"
 
-class FileNode(BaseModel):
-    model_config = ConfigDict(use_enum_values=True)
+# Dataclasses can only generate __slots__ on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
+@dataclass(**_SLOTS)
+class FileNode:
     name: str
     path: str
-    node_type: NodeType
+    node_type: str  # a NodeType value: "file" or "directory"
     is_ignored: bool = False
     is_selected: bool = True
     children: Optional[List['FileNode']] = None
-    metadata: Dict[str, Any] = {}
\ No newline at end of file
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # NodeType members are stored as their plain string values
+        if isinstance(self.node_type, NodeType):
+            self.node_type = self.node_type.value
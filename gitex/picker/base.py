@@ -1,8 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import translate
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from gitex.listing_cache import Listing, ListingCache, scan_dir
 from gitex.models import FileNode
 import os
+import re
+import stat
 import pathspec
+from pathspec.util import normalize_file
+
+# Compiled .gitignore specs, keyed by (path, mtime_ns, size) so edits are picked up
+_GITIGNORE_SPECS: Dict[Tuple[str, int, int], "GitignoreSpec"] = {}
+
+# Named groups in pathspec's regexes would clash once the patterns are joined
+_NAMED_GROUP_RE = re.compile(r"\(\?P<\w+>")
 
 
 class Picker(ABC):
@@ -20,39 +33,100 @@ class DefaultPicker(Picker):
     """
     Default picker that recursively collects FileNode objects.
     Can ignore hidden files, and optionally respect .gitignore patterns.
+    With max_workers > 1, directories are listed on a thread pool ahead of the walk,
+    which helps on slow or network filesystems but costs time on a warm local disk.
     """
-    def __init__(self, ignore_hidden: bool = True, respect_gitignore: bool = False):
+    def __init__(
+        self,
+        ignore_hidden: bool = True,
+        respect_gitignore: bool = False,
+        exclude_patterns: Optional[Iterable[str]] = None,
+        use_cache: bool = False,
+        max_workers: Optional[int] = None,
+    ):
         self.ignore_hidden = ignore_hidden
         self.respect_gitignore = respect_gitignore
-        self._gitignore_spec: Optional[pathspec.PathSpec] = None
+        self.use_cache = use_cache
+        self.max_workers = max_workers
+        self._is_excluded = compile_exclude_patterns(exclude_patterns)
+        self._gitignore_spec: Optional[GitignoreSpec] = None
+        self._listings: Optional[ListingCache] = None
+        self._prefetched: Dict[str, Listing] = {}
 
     def pick(self, root_path: str) -> List[FileNode]:
         # Load .gitignore patterns if needed
         if self.respect_gitignore:
             self._load_gitignore(root_path)
-
         # Return the root directory itself to preserve structure
-        return [self._walk(root_path, root_path)]
+        return [self.walk_subtree(root_path, root_path)]
+
+    def walk_subtree(self, path: str, root_path: str) -> FileNode:
+        """
+        Walk the tree at path, which lies under root_path. Names are skipped as in pick(root_path);
+        its .gitignore must already be loaded (see _load_gitignore).
+        """
+        if self.use_cache:
+            self._listings = ListingCache(path)
+        try:
+            if self.max_workers is not None and self.max_workers > 1:
+                self._prefetch(path, root_path)
+            return self._walk(path, root_path)
+        finally:
+            if self._listings is not None:
+                self._listings.save()
+            self._listings = None
+            self._prefetched.clear()
     
-    def _walk(self, path: str, root_path: str) -> FileNode:
+    def pick_shallow(self, root_path: str) -> List[FileNode]:
+        """
+        Like pick(), but only the root directory is listed. Directories below it are
+        left unlisted (children None) until expand() is called on them.
+        """
+        if self.respect_gitignore:
+            self._load_gitignore(root_path)
+        is_dir = os.path.isdir(root_path)
+        root = FileNode(name=".", path=root_path, node_type="directory" if is_dir else "file")
+        if is_dir:
+            self.expand(root, root_path)
+        return [root]
+
+    def expand(self, node: FileNode, root_path: str) -> None:
+        """List the direct children of a directory node returned by pick_shallow()."""
+        try:
+            entries = self._list_dir(node.path)
+        except PermissionError:
+            entries = []
+        children = []
+        for entry_name, entry_is_dir in entries:
+            if self._should_skip(entry_name, root_path, parent_path=node.path):
+                continue
+            path = os.path.join(node.path, entry_name)
+            if entry_is_dir is None:
+                entry_is_dir = os.path.isdir(path)
+            children.append(FileNode(name=entry_name, path=path, node_type="directory" if entry_is_dir else "file"))
+        node.children = children
+
+    def _walk(self, path: str, root_path: str, is_dir: Optional[bool] = None) -> FileNode:
         # Use "." for the root node name to match standard tree output
         if path == root_path:
             name = "."
         else:
             name = os.path.basename(path) or path
 
-        is_dir = os.path.isdir(path)
+        # Children get is_dir from the directory listing; only symlinks need an extra stat()
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
         children = None
         if is_dir:
             try:
-                entries = sorted(os.listdir(path))
+                entries = self._list_dir(path)
             except PermissionError:
                 entries = []
             children = []
-            for entry in entries:
-                if self._should_skip(entry, root_path, parent_path=path):
+            for entry_name, entry_is_dir in entries:
+                if self._should_skip(entry_name, root_path, parent_path=path):
                     continue
-                children.append(self._walk(os.path.join(path, entry), root_path))
+                children.append(self._walk(os.path.join(path, entry_name), root_path, entry_is_dir))
         return FileNode(
             name=name,
             path=path,
@@ -60,11 +134,48 @@ class DefaultPicker(Picker):
             children=children
         )
 
+    def _prefetch(self, path: str, root_path: str):
+        """List every directory the walk of path will visit, one tree level at a time on a thread pool."""
+        def list_dir(path: str) -> Optional[Listing]:
+            try:
+                return self._list_dir(path)
+            except OSError:
+                # Left for the walk, which handles or raises it as usual
+                return None
+
+        level = [path]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while level:
+                next_level = []
+                for path, entries in zip(level, pool.map(list_dir, level)):
+                    if entries is None:
+                        continue
+                    self._prefetched[path] = entries
+                    for entry_name, entry_is_dir in entries:
+                        if self._should_skip(entry_name, root_path, parent_path=path):
+                            continue
+                        entry_path = os.path.join(path, entry_name)
+                        if entry_is_dir or (entry_is_dir is None and os.path.isdir(entry_path)):
+                            next_level.append(entry_path)
+                level = next_level
+
+    def _list_dir(self, path: str) -> Listing:
+        entries = self._prefetched.pop(path, None)
+        if entries is not None:
+            return entries
+        if self._listings is not None:
+            return self._listings.list_dir(path)
+        return scan_dir(path)
+
     def _should_skip(self, name: str, root_path: str, parent_path: Optional[str] = None) -> bool:
         # Hidden files
         if self.ignore_hidden and name.startswith('.'):
             return True
 
+        # Excluded names are skipped before their subtree is ever walked
+        if self._is_excluded is not None and self._is_excluded(name):
+            return True
+
         # Gitignore
         if self.respect_gitignore and self._gitignore_spec is not None:
             # compute relative path from root for matching
@@ -75,11 +186,76 @@ class DefaultPicker(Picker):
         return False
 
     def _load_gitignore(self, root_path: str):
-        gitignore_file = os.path.join(root_path, '.gitignore')
-        if pathspec and os.path.isfile(gitignore_file):
-            with open(gitignore_file, 'r', encoding='utf-8') as f:
-                lines = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
-            self._gitignore_spec = pathspec.PathSpec.from_lines('gitwildmatch', lines)
-        else:
-            self._gitignore_spec = None
-            
\ No newline at end of file
+        self._gitignore_spec = load_gitignore_spec(root_path)
+
+
+def compile_exclude_patterns(patterns: Optional[Iterable[str]]) -> Optional[Callable[[str], object]]:
+    """
+    Compile fnmatch-style name patterns into one regex, so each name is matched once.
+    Returns a predicate on names (truthy when excluded), or None when there are no patterns.
+    Results are memoized because the same names (__init__.py, README.md, ...) recur throughout a tree.
+    """
+    if not patterns:
+        return None
+    match = _exclude_regex(tuple(patterns)).match
+    if os.path.normcase("A") != "A":
+        # Case-insensitive platforms match the normalized name
+        regex_match = match
+        match = lambda name: regex_match(os.path.normcase(name))
+    return lru_cache(maxsize=None)(match)
+
+
+@lru_cache(maxsize=None)
+def _exclude_regex(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Translate and compile a set of patterns once per process, however many pickers use them."""
+    return re.compile("|".join(f"(?:{translate(os.path.normcase(p))})" for p in patterns))
+
+
+class GitignoreSpec:
+    """
+    A parsed .gitignore matched with one regex per run of same-polarity patterns,
+    instead of one regex per pattern. Matches exactly like pathspec.PathSpec.match_file:
+    the last matching pattern decides, so the runs are checked from last to first.
+    """
+    def __init__(self, spec: pathspec.PathSpec):
+        runs: List[Tuple[bool, List[str]]] = []
+        for pattern in spec.patterns:
+            if pattern.include is None:
+                continue
+            regex = _NAMED_GROUP_RE.sub("(?:", pattern.regex.pattern)
+            if runs and runs[-1][0] == pattern.include:
+                runs[-1][1].append(regex)
+            else:
+                runs.append((pattern.include, [regex]))
+        self._runs = [
+            (include, re.compile("|".join(f"(?:{regex})" for regex in regexes)).match)
+            for include, regexes in reversed(runs)
+        ]
+
+    def match_file(self, file: str) -> bool:
+        norm_file = normalize_file(file)
+        for include, match in self._runs:
+            if match(norm_file) is not None:
+                return include
+        return False
+
+
+def load_gitignore_spec(root_path: str) -> Optional[GitignoreSpec]:
+    """
+    Return the compiled .gitignore at root_path, or None if there is none.
+    Specs are compiled once and reused until the file changes.
+    """
+    gitignore_file = os.path.join(root_path, '.gitignore')
+    try:
+        st = os.stat(gitignore_file)
+    except OSError:
+        return None
+    if not pathspec or not stat.S_ISREG(st.st_mode):
+        return None
+    key = (os.path.abspath(gitignore_file), st.st_mtime_ns, st.st_size)
+    spec = _GITIGNORE_SPECS.get(key)
+    if spec is None:
+        with open(gitignore_file, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+        spec = _GITIGNORE_SPECS[key] = GitignoreSpec(pathspec.PathSpec.from_lines('gitwildmatch', lines))
+    return spec
\ No newline at end of file
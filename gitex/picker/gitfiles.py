@@ -0,0 +1,132 @@
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+import git
+
+from gitex.models import FileNode
+from .base import Picker, DefaultPicker, compile_exclude_patterns
+
+# Index entries with these modes are submodules (gitlinks) and symlinks, not regular files
+_GITLINK_MODE = "160000"
+_SYMLINK_MODE = "120000"
+
+# Marks a tree entry whose contents git doesn't list (submodules, nested repositories)
+_SUBTREE = object()
+
+
+class GitPicker(Picker):
+    """
+    Picker that builds the tree from Git's file listing instead of walking the filesystem.
+    Includes tracked files and untracked files that are not ignored, so every .gitignore,
+    .git/info/exclude and the global excludes file are honoured. Directories git only lists
+    as a single entry (submodules, nested repositories) are walked with DefaultPicker.
+    """
+    def __init__(
+        self,
+        ignore_hidden: bool = True,
+        exclude_patterns: Optional[Iterable[str]] = None,
+        use_cache: bool = False,
+        max_workers: Optional[int] = None,
+    ):
+        self.ignore_hidden = ignore_hidden
+        self._is_excluded = compile_exclude_patterns(exclude_patterns)
+        self.default_picker = DefaultPicker(
+            ignore_hidden=ignore_hidden,
+            respect_gitignore=True,
+            exclude_patterns=exclude_patterns,
+            use_cache=use_cache,
+            max_workers=max_workers,
+        )
+
+    def pick(self, root_path: str) -> List[FileNode]:
+        # git would run from the file's directory and list all of it
+        if not os.path.isdir(root_path):
+            return self.default_picker.pick(root_path)
+        try:
+            if _is_ignored(root_path):
+                # git lists nothing untracked under an ignored directory
+                return self.default_picker.pick(root_path)
+            paths, subtrees = self._list_files(root_path)
+        except git.GitCommandError:
+            return self.default_picker.pick(root_path)
+        if not paths and not subtrees and os.listdir(root_path):
+            # e.g. the inside of .git, which git never lists
+            return self.default_picker.pick(root_path)
+
+        tree: Dict[str, object] = {}
+        for rel_path in paths:
+            self._insert(tree, rel_path, None)
+        for rel_path in subtrees:
+            self._insert(tree, rel_path, _SUBTREE)
+
+        if subtrees:
+            self.default_picker._load_gitignore(root_path)
+        return [self._build(".", root_path, tree, root_path)]
+
+    def _list_files(self, root_path: str):
+        """
+        Return the existing files under root_path, relative to it, and the
+        relative paths of subtrees git does not list file by file.
+        """
+        # Run from root_path, so paths come back relative to it and limited to its subtree
+        g = git.Git(root_path)
+        deleted = set(_split(g.ls_files("-z", "-d")))
+        paths: Set[str] = set()
+        subtrees: Set[str] = set()
+        for entry in _split(g.ls_files("-z", "-c", "-s")):
+            meta, _, rel_path = entry.partition('\t')
+            if meta.startswith(_GITLINK_MODE):
+                subtrees.add(rel_path)
+            elif rel_path in deleted:
+                continue
+            elif meta.startswith(_SYMLINK_MODE) and os.path.isdir(os.path.join(root_path, rel_path)):
+                # git stores the link itself; the directory it points to is walked instead
+                subtrees.add(rel_path)
+            else:
+                paths.add(rel_path)
+        for rel_path in _split(g.ls_files("-z", "-o", "--exclude-standard")):
+            # Untracked nested repositories are listed as "dir/"
+            if rel_path.endswith('/'):
+                subtrees.add(rel_path.rstrip('/'))
+            # Untracked entries come without a mode: the only ones that are directories are symlinks
+            elif os.path.isdir(os.path.join(root_path, rel_path)):
+                subtrees.add(rel_path)
+            else:
+                paths.add(rel_path)
+        return paths, subtrees
+
+    def _insert(self, tree: Dict[str, object], rel_path: str, kind: Optional[object]):
+        """Add a file (kind None) or an unlisted subtree (_SUBTREE) to the nested name -> entry dict."""
+        parts = rel_path.split('/')
+        if self.ignore_hidden and any(part.startswith('.') for part in parts):
+            return
+        if self._is_excluded is not None and any(self._is_excluded(part) for part in parts):
+            return
+        entries = tree
+        for part in parts[:-1]:
+            entries = entries.setdefault(part, {})
+            if not isinstance(entries, dict):
+                return
+        entries.setdefault(parts[-1], kind)
+
+    def _build(self, name: str, path: str, entries: Optional[object], root_path: str) -> FileNode:
+        if entries is _SUBTREE:
+            return self.default_picker.walk_subtree(path, root_path)
+        if entries is None:
+            return FileNode(name=name, path=path, node_type="file")
+        children = [
+            self._build(child_name, os.path.join(path, child_name), child_entries, root_path)
+            for child_name, child_entries in sorted(entries.items())
+        ]
+        return FileNode(name=name, path=path, node_type="directory", children=children)
+
+
+def _is_ignored(path: str) -> bool:
+    """Whether the directory at path is ignored by git (itself or through a parent)."""
+    status, _, _ = git.Git(path).check_ignore("-q", ".", with_exceptions=False, with_extended_output=True)
+    return status == 0
+
+
+def _split(output: str) -> Iterable[str]:
+    """Split NUL-separated git output."""
+    return (entry for entry in output.split('\0') if entry)
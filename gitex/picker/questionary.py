@@ -1,4 +1,4 @@
-from typing import List, Set
+from typing import Iterable, List, Optional, Set
 from gitex.models import FileNode
 import questionary
 from .base import Picker, DefaultPicker
@@ -8,8 +8,13 @@ class QuestinoaryPicker(Picker):
     Interactive picker that presents an interactive checkbox-based terminal UI
     for users to select which files to include.
     """
-    def __init__(self, ignore_hidden: bool = True, respect_gitignore: bool = False):
-        self.base_picker = DefaultPicker(ignore_hidden, respect_gitignore)
+    def __init__(
+        self,
+        ignore_hidden: bool = True,
+        respect_gitignore: bool = False,
+        exclude_patterns: Optional[Iterable[str]] = None,
+    ):
+        self.base_picker = DefaultPicker(ignore_hidden, respect_gitignore, exclude_patterns)
 
     def pick(self, root_path: str) -> List[FileNode]:
         # Build full tree of FileNodes
@@ -44,6 +49,7 @@ class QuestinoaryPicker(Picker):
         """
         Recursively retain only branches that lead to selected files.
         Directories with no selected children are removed. Selected files kept.
+        Prunes in place: the tree is the one pick() just built, so nothing else refers to it.
         """
         pruned: List[FileNode] = []
         for node in nodes:
@@ -54,7 +60,6 @@ class QuestinoaryPicker(Picker):
                 # Directory: prune children
                 children = self._prune_tree(node.children or [], selected_set)
                 if children:
-                    new_node = node.copy(deep=True)
-                    new_node.children = children
-                    pruned.append(new_node)
+                    node.children = children
+                    pruned.append(node)
         return pruned
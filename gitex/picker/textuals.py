@@ -1,7 +1,10 @@
 # gitex/picker/textuals.py
 import logging
-from typing import List, Set, Dict
-from pathlib import Path
+import os
+import stat
+from dataclasses import replace
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set
 from gitex.models import FileNode
 from gitex.picker.base import Picker, DefaultPicker
 from textual.app import App, ComposeResult
@@ -15,6 +18,20 @@ from rich.text import Text
 
 from gitex.slicer import get_symbols_in_file, resolve_slice_dependencies
 
+# Selection state -> (checkbox, style) of a tree label
+_MARKS = {2: ("[✓]", "bold green"), 1: ("[-]", ""), 0: ("[ ]", "")}
+
+
+@lru_cache(maxsize=8192)
+def _label(state: int, name: str) -> Text:
+    """
+    Shared label for a name in a selection state. Safe to reuse across nodes:
+    Tree.process_label copies a label before storing it.
+    """
+    mark, style = _MARKS[state]
+    return Text(f"{mark} {name}", style=style)
+
+
 class SymbolSelectionScreen(ModalScreen[str]):
     """Screen to select a symbol for slicing."""
     
@@ -58,12 +75,20 @@ class TextualPicker(Picker):
     """
     Uses Textual to display a navigable tree of FileNodes with checkboxes.
     """
-    def __init__(self, ignore_hidden: bool = True, respect_gitignore: bool = False):
-        self.default_picker = DefaultPicker(ignore_hidden=ignore_hidden, respect_gitignore=respect_gitignore)
+    def __init__(
+        self,
+        ignore_hidden: bool = True,
+        respect_gitignore: bool = False,
+        exclude_patterns: Optional[Iterable[str]] = None,
+    ):
+        self.default_picker = DefaultPicker(
+            ignore_hidden=ignore_hidden, respect_gitignore=respect_gitignore, exclude_patterns=exclude_patterns
+        )
 
     def pick(self, root_path: str) -> List[FileNode]:
-        raw = self.default_picker.pick(root_path)
-        app = _PickerApp(raw)
+        # Directories are listed as the user expands or selects them, not all up front
+        raw = self.default_picker.pick_shallow(root_path)
+        app = _PickerApp(raw, loader=lambda node: self.default_picker.expand(node, root_path))
         app.run()
         return app.selected_nodes
 
@@ -106,11 +131,17 @@ class _PickerApp(App):
             super().__init__()
             self.paths = paths
 
-    def __init__(self, nodes: List[FileNode], **kwargs):
+    def __init__(self, nodes: List[FileNode], loader: Optional[Callable[[FileNode], None]] = None, **kwargs):
         super().__init__(**kwargs)
         self.nodes = nodes
+        # Fills in the children of directories left unlisted (children None); None if the tree is complete
+        self.loader = loader
         self.selected_paths: Set[str] = set()
         self.selected_nodes: List[FileNode] = []
+        # Selection state per path, filled bottom-up; entries are dropped or reset when selection changes
+        self._state_cache: Dict[str, int] = {}
+        # Resolved absolute path -> node path, built on the first slice
+        self._abs_to_node: Optional[Dict[str, str]] = None
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -118,9 +149,10 @@ class _PickerApp(App):
         root_node = self.nodes[0]
         tree = Tree(self._format_label(root_node), id="picker-tree", data=root_node)
 
+        self._load_children(root_node)
         if root_node.children:
             for child in root_node.children:
-                tree.root.add(self._format_label(child), data=child, allow_expand=bool(child.children))
+                tree.root.add(self._format_label(child), data=child, allow_expand=self._may_have_children(child))
 
         yield tree
 
@@ -139,64 +171,102 @@ class _PickerApp(App):
         node = event.node
         file_node: FileNode = node.data
         if file_node and not node.children:
-            for child in file_node.children:
-                node.add(self._format_label(child), data=child, allow_expand=bool(child.children))
+            self._load_children(file_node)
+            for child in file_node.children or []:
+                node.add(self._format_label(child), data=child, allow_expand=self._may_have_children(child))
+
+    def _may_have_children(self, file_node: FileNode) -> bool:
+        """Whether a node should be expandable; unlisted directories are until they turn out empty."""
+        if file_node.children is None:
+            return self.loader is not None and file_node.node_type == "directory"
+        return bool(file_node.children)
+
+    def _load_children(self, file_node: FileNode) -> None:
+        """List an unlisted directory's direct children."""
+        if self.loader is not None and file_node.node_type == "directory" and file_node.children is None:
+            self.loader(file_node)
+
+    def _load_subtree(self, file_node: FileNode) -> None:
+        """List every unlisted directory under file_node."""
+        if self.loader is None:
+            return
+        stack = [file_node]
+        while stack:
+            current = stack.pop()
+            self._load_children(current)
+            if current.children:
+                stack.extend(current.children)
 
     def _get_selection_state(self, file_node: FileNode) -> int:
         """Calculates selection from Data Model. 2 if fully selected, 1 if partially selected, 0 if not selected."""
-        if file_node.path in self.selected_paths:
-            return 2
-            
-        if file_node.node_type == "file" or not file_node.children:
-            return 0
-            
-        child_states = [self._get_selection_state(c) for c in file_node.children]
-        
-        if all(s == 2 for s in child_states) and child_states:
-            return 2
-        if any(s > 0 for s in child_states):
-            return 1
-        return 0
+        state_cache = self._state_cache
+        state = state_cache.get(file_node.path)
+        if state is not None:
+            return state
+
+        # Post-order over the uncached part of the subtree, so each node's state is computed once
+        stack = [(file_node, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if node.path in state_cache:
+                continue
+            if node.path in self.selected_paths:
+                state = 2
+            elif node.node_type == "file" or not node.children:
+                state = 0
+            elif not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children)
+                continue
+            else:
+                child_states = [state_cache[c.path] for c in node.children]
+                if all(s == 2 for s in child_states):
+                    state = 2
+                elif any(s > 0 for s in child_states):
+                    state = 1
+                else:
+                    state = 0
+            state_cache[node.path] = state
+        return state_cache[file_node.path]
 
     def _format_label(self, file_node: FileNode) -> Text:
         """Generate label with colored checkbox and name based on Data Model selection state."""
-        state = self._get_selection_state(file_node)
-        if state == 2:
-            mark = "[✓]"
-            style = "bold green"
-        elif state == 1:
-            mark = "[-]"
-            style = ""
-        else:
-            mark = "[ ]"
-            style = ""
-            
-        label = f"{mark} {file_node.name}"
-        return Text(label, style=style)
+        return _label(self._get_selection_state(file_node), file_node.name)
 
     def _set_subtree_selection(self, file_node: FileNode, select: bool) -> None:
-        """Recursively update selected_paths using the Data Model (FileNode)."""
+        """Update selected_paths for a whole subtree of the Data Model (FileNode) in one bulk set operation."""
+        paths = []
+        stack = [file_node]
+        while stack:
+            node = stack.pop()
+            paths.append(node.path)
+            if node.children:
+                stack.extend(node.children)
+
         if select:
-            self.selected_paths.add(file_node.path)
+            self.selected_paths.update(paths)
         else:
-            self.selected_paths.discard(file_node.path)
-        
-        if file_node.children:
-            for child in file_node.children:
-                self._set_subtree_selection(child, select)
+            self.selected_paths.difference_update(paths)
+        # The whole subtree ends up uniformly selected or unselected
+        self._state_cache.update(dict.fromkeys(paths, 2 if select else 0))
 
     def _update_parent_label(self, node: TreeNode) -> None:
-        """Update a parent node's label based on selection state."""
-        if not node.data: return
-        node.set_label(self._format_label(node.data))
-        if node.parent: self._update_parent_label(node.parent)
+        """Update the labels of a parent node and its ancestors based on selection state."""
+        # Bottom-up, so each level recomputes its state from its children's cached states
+        while node is not None and node.data:
+            self._state_cache.pop(node.data.path, None)
+            node.set_label(self._format_label(node.data))
+            node = node.parent
 
     def _refresh_subtree_visuals(self, tree_node: TreeNode) -> None:
-        """Recursively update labels for existing UI TreeNodes."""
-        if tree_node.data:
-            tree_node.set_label(self._format_label(tree_node.data))
-        for child in tree_node.children:
-            self._refresh_subtree_visuals(child)
+        """Update labels for the existing UI TreeNodes of a subtree, repainting the screen once."""
+        with self.batch_update():
+            stack = [tree_node]
+            while stack:
+                node = stack.pop()
+                if node.data:
+                    node.set_label(self._format_label(node.data))
+                stack.extend(node.children)
 
     async def on_key(self, event: events.Key) -> None:
         """Handle key presses: space to toggle, enter to confirm, q to quit."""
@@ -245,16 +315,16 @@ class _PickerApp(App):
                 root_path = self.nodes[0].path
                 deps = resolve_slice_dependencies(root_path, file_node.path, selected_symbol)
 
-                abs_to_node = self._get_absolute_to_node_path_mapping(self.nodes)
+                for root_node in self.nodes:
+                    self._load_subtree(root_node)
+                abs_to_node = self._absolute_to_node_paths()
                 
-                matched_count = 0
-                for abs_path in deps:
-                    if abs_path in abs_to_node:
-                        internal_path = abs_to_node[abs_path]
-                        self.selected_paths.add(internal_path)
-                        logging.info(f"Matched and selected internal path: {internal_path}")
-                        matched_count += 1
+                matched = deps & abs_to_node.keys()
+                self.selected_paths.update(abs_to_node[abs_path] for abs_path in matched)
+                matched_count = len(matched)
+                logging.info(f"Matched and selected {matched_count} internal path(s)")
 
+                self._state_cache.clear()
                 self._refresh_subtree_visuals(tree.root)
                 self.notify(f"Sliced '{selected_symbol}': Auto-checked {matched_count} file(s).", severity="information")
             except Exception as e:
@@ -264,17 +334,36 @@ class _PickerApp(App):
         # Open the modal and pass the callback function
         self.push_screen(SymbolSelectionScreen(file_node.name, symbols), callback=handle_slice_selection)
 
-    def _get_absolute_to_node_path_mapping(self, nodes: List[FileNode]) -> Dict[str, str]:
-        """Pre-computes lookup tables since path representation may vary."""
-        mapping = {}
-        for n in nodes:
-            try:
-                mapping[str(Path(n.path).resolve())] = n.path
-            except Exception:
-                pass
-            if n.children:
-                mapping.update(self._get_absolute_to_node_path_mapping(n.children))
-        return mapping
+    def _absolute_to_node_paths(self) -> Dict[str, str]:
+        """
+        Pre-computes lookup tables since path representation may vary.
+        Built once: slicing lists the whole tree first, so it does not change afterwards.
+        """
+        if self._abs_to_node is None:
+            mapping = {}
+            # Pre-order, so a later node wins when two resolve to the same file, as before.
+            # A child that is not a symlink resolves to its parent's real path plus its name,
+            # which costs one lstat() instead of realpath() re-checking every ancestor.
+            stack = [(n, None) for n in reversed(self.nodes)]
+            while stack:
+                n, parent_real = stack.pop()
+                real = None
+                try:
+                    if parent_real is not None and not stat.S_ISLNK(os.lstat(n.path).st_mode):
+                        real = os.path.join(parent_real, n.name)
+                    else:
+                        real = os.path.realpath(n.path)
+                except (OSError, ValueError):
+                    try:
+                        real = os.path.realpath(n.path)
+                    except (OSError, ValueError):
+                        pass
+                if real is not None:
+                    mapping[real] = n.path
+                if n.children:
+                    stack.extend((c, real) for c in reversed(n.children))
+            self._abs_to_node = mapping
+        return self._abs_to_node
 
     async def action_confirm(self) -> None:
         """Gather selected nodes while preserving hierarchy, then exit."""
@@ -287,9 +376,7 @@ class _PickerApp(App):
                 else:
                     children = prune(n.children or [])
                     if children or n.path in self.selected_paths:
-                        new_node = n.model_copy(deep=True)
-                        new_node.children = children
-                        out.append(new_node)
+                        out.append(replace(n, children=children))
             return out
 
         self.selected_nodes = prune(self.nodes)
@@ -329,13 +416,12 @@ class _PickerApp(App):
         file_node: FileNode = node.data
         is_selecting = file_node.path not in self.selected_paths
 
-        self._set_subtree_selection(file_node, is_selecting)
-        self._refresh_subtree_visuals(node)
-        
-        if node.parent:
-            self._update_parent_label(node.parent)
-
-    async def on_tree_node_highlighted(self, event: Tree.NodeHighlighted) -> None:
-        """Keep the highlighted (cursor) node visible while navigating."""
-        tree = event.control
-        tree.scroll_to_node(event.node, animate=False)
\ No newline at end of file
+        # Selecting a directory selects everything below it, so all of it has to be listed
+        if is_selecting:
+            self._load_subtree(file_node)
+        # One screen update for the subtree and its ancestors together
+        with self.batch_update():
+            self._set_subtree_selection(file_node, is_selecting)
+            self._refresh_subtree_visuals(node)
+            if node.parent:
+                self._update_parent_label(node.parent)
@@ -1,6 +1,8 @@
 import os
 import re
-from typing import List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
 from gitex.models import FileNode
 from gitex.docstring_extractor import extract_docstrings
 from pathlib import Path
@@ -10,18 +12,23 @@ class Renderer:
     Rendered takes a list of FileNode objects and produces prompt-ready representations:
       - render_tree(): shows the directory/file hierarchy in ASCII form
       - render_files(): prints each file's contents, prefixed by its full path
+    iter_tree() and iter_files() produce the same output piece by piece, for streaming.
+    With max_workers > 1, files are read ahead on a thread pool (useful on slow or network filesystems).
     """
-    def __init__(self, nodes: List[FileNode]):
+    def __init__(self, nodes: List[FileNode], max_workers: Optional[int] = None):
         self.nodes = nodes
+        self.max_workers = max_workers
 
     def render_tree(self) -> str:
         """Return an ASCII tree of the FileNode hierarchy."""
-        lines = []
+        return "\n".join(self.iter_tree())
+
+    def iter_tree(self) -> Iterator[str]:
+        """Yield the lines of render_tree(), without line endings."""
         for root in self.nodes:
-            lines.append(self._format_node_header(root))
+            yield self._format_node_header(root)
             if root.children:
-                lines.extend(self._format_children(root.children, prefix=""))
-        return "\n".join(lines)
+                yield from self._format_children(root.children, prefix="")
 
     def _format_node_header(self, node: FileNode) -> str:
         """Format the header line for a root node."""
@@ -46,31 +53,29 @@ class Renderer:
         return formatted
 
     def render_files(self, base_dir: Optional[str] = None) -> str:
-        file_nodes = self._collect_files(self.nodes)
-        blocks = []
-
-        for node in file_nodes:
-            path_display = self._relative_path(node.path, base_dir)
+        return "\n\n".join(self.iter_files(base_dir))
 
-            # Skip decoding/reading image files; just list them later
-            if _is_binary_file(node.path):
-                continue
+    def iter_files(self, base_dir: Optional[str] = None) -> Iterator[str]:
+        """Yield the blocks of render_files() one file at a time, so only a few files are held in memory."""
+        # Skip decoding/reading image files; just list them later
+        file_nodes = [node for node in self._collect_files(self.nodes) if not _is_binary_file(node.path)]
+        contents = self._read_files(node.path for node in file_nodes)
 
-            content = self._read_file(node.path)
+        for node, content in zip(file_nodes, contents):
+            path_display = self._relative_path(node.path, base_dir)
 
             lang = _detect_lang(node.path)
             open_fence, close_fence = _build_fence(content, lang)
 
-            blocks.append(
+            yield (
                 f"# {path_display}\n"
                 f"{open_fence}\n"
                 f"{content}\n"
                 f"{close_fence}"
             )
 
-        return "\n\n".join(blocks)
-
-    def render_docstrings(self, base_dir: Optional[str] = None, symbol_target: Optional[str] = None, include_empty_classes: bool = False) -> str:
+    def render_docstrings(self, base_dir: Optional[str] = None, symbol_target: Optional[str] = None, include_empty_classes: bool = False,
+                          use_cache: bool = False) -> str:
         """Return all file contents, each block prefixed by its full or relative path."""
         file_nodes = self._collect_files(self.nodes)
         blocks = []
@@ -91,7 +96,7 @@ class Renderer:
             
             if target_file_path:
                 path_display = self._relative_path(target_file_path, base_dir)
-                content = extract_docstrings(Path(target_file_path), symbol_target, include_empty_classes)
+                content = extract_docstrings(Path(target_file_path), symbol_target, include_empty_classes, use_cache)
                 blocks.append(f"# {path_display}\n{content}")
             else:
                 return f"Error: Could not find a Python file corresponding to the symbol '{symbol_target}'."
@@ -102,7 +107,7 @@ class Renderer:
                 if not node.name.endswith(".py"):
                     continue
                 path_display = self._relative_path(node.path, base_dir)
-                content = extract_docstrings(Path(node.path), None, include_empty_classes)
+                content = extract_docstrings(Path(node.path), None, include_empty_classes, use_cache)
                 blocks.append(f"# {path_display}\n{content}")
 
         return "\n\n".join(blocks)
@@ -123,6 +128,20 @@ class Renderer:
             return path[len(base_dir):].lstrip(os.sep)
         return path
 
+    def _read_files(self, paths: Iterable[str]) -> Iterator[str]:
+        """Yield the contents of paths in order, reading at most 2 * max_workers files ahead."""
+        if self.max_workers is None or self.max_workers <= 1:
+            yield from map(self._read_file, paths)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = deque()
+            for path in paths:
+                pending.append(pool.submit(self._read_file, path))
+                if len(pending) >= 2 * self.max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
     def _read_file(self, path: str) -> str:
         """Safely read file contents, returning error message on failure."""
         try:
@@ -33,9 +33,14 @@ def get_symbols_in_file(file_path: str) -> List[str]:
 def get_used_names(node: ast.AST) -> Set[str]:
     """Recursively collect all variable/class names used inside an AST node."""
     used = set()
-    for child in ast.walk(node):
-        if isinstance(child, ast.Name):
+    # Explicit stack instead of ast.walk; Name nodes are leaves, so there is no need to descend into them
+    stack = [node]
+    while stack:
+        child = stack.pop()
+        if type(child) is ast.Name:
             used.add(child.id)
+        else:
+            stack.extend(ast.iter_child_nodes(child))
     return used
 
 def resolve_slice_dependencies(root_path: str, start_file: str, symbol_name: str) -> Set[str]:
@@ -7,26 +7,29 @@ from gitex.models import FileNode, NodeType
 
 
 def build_file_tree(root_path: str, ignore_hidden: bool = True) -> FileNode:
-    def walk_dir(current_path: str) -> FileNode:
+    def walk_dir(current_path: str, is_dir: bool) -> FileNode:
         name = os.path.basename(current_path)
         if not name:  # If root_path is '/', basename would be ''
             name = current_path
 
-        is_dir = os.path.isdir(current_path)
         node_type = NodeType.DIRECTORY if is_dir else NodeType.FILE
 
         if is_dir:
             try:
-                entries = os.listdir(current_path)
+                with os.scandir(current_path) as it:
+                    entries = list(it)
             except PermissionError:
                 entries = []
 
             children = []
             for entry in entries:
-                full_path = os.path.join(current_path, entry)
-                if ignore_hidden and entry.startswith('.'):
+                if ignore_hidden and entry.name.startswith('.'):
                     continue
-                children.append(walk_dir(full_path))
+                try:
+                    entry_is_dir = entry.is_dir()
+                except OSError:
+                    entry_is_dir = False
+                children.append(walk_dir(entry.path, entry_is_dir))
         else:
             children = None
 
@@ -37,7 +40,7 @@ def build_file_tree(root_path: str, ignore_hidden: bool = True) -> FileNode:
             children=children
         )
 
-    return walk_dir(root_path)
+    return walk_dir(root_path, os.path.isdir(root_path))
 
 
 def copy_to_clipboard(text: str) -> bool:
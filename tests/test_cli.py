@@ -1,4 +1,7 @@
+import os
 import shutil
+import subprocess
+import sys
 import tempfile
 import unittest
 from pathlib import Path
@@ -8,7 +11,8 @@ from click.testing import CliRunner
 from git import Repo
 
 # Import the main entry point
-from gitex.main import cli
+from gitex.main import _collect_python_files, cli
+from gitex.models import FileNode, NodeType
 
 
 class TestGitExCLI(unittest.TestCase):
@@ -137,11 +141,88 @@ class TestGitExCLI(unittest.TestCase):
         self.assertIn("[Copied to clipboard]", result.stderr)
         self.assertIn("data", result.stdout)
 
+    @patch("gitex.main.copy_to_clipboard")
+    def test_emit_matches_clipboard_output(self, mock_copy):
+        """
+        Test that --emit streams exactly what would have been copied,
+        without touching the clipboard.
+        """
+        mock_copy.return_value = True
+        (Path(self.test_dir) / "a.py").write_text("print('a')\n", encoding="utf-8")
+        (Path(self.test_dir) / "b.txt").write_text("bee", encoding="utf-8")
+
+        copied = self.runner.invoke(cli, [self.test_dir, "--force"])
+        emitted = self.runner.invoke(cli, [self.test_dir, "--force", "--emit"])
+
+        self.assertEqual(emitted.exit_code, 0)
+        self.assertEqual(mock_copy.call_count, 1)
+        self.assertEqual(emitted.stdout, mock_copy.call_args[0][0] + "\n")
+        self.assertIn("print('a')", emitted.stdout)
+        self.assertEqual(copied.stdout, "")
+
+    def test_emit_file_path_in_git_repo(self):
+        """Test that a file PATH inside a repo renders only that file."""
+        repo = Repo.init(self.test_dir)
+        (Path(self.test_dir) / "a.py").write_text("print('a')\n", encoding="utf-8")
+        (Path(self.test_dir) / "sub").mkdir()
+        (Path(self.test_dir) / "sub" / "b.py").write_text("print('b')\n", encoding="utf-8")
+        repo.index.add(["a.py", "sub/b.py"])
+
+        result = self.runner.invoke(cli, [str(Path(self.test_dir) / "a.py"), "--emit"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("print('a')", result.stdout)
+        self.assertNotIn("print('b')", result.stdout)
+        self.assertNotIn("Error reading", result.stdout)
+
+    def test_no_cache_writes_nothing(self):
+        """Test that --no-cache leaves the cache directory untouched, and that the CLI caches by default."""
+        (Path(self.test_dir) / "pkg").mkdir()
+        (Path(self.test_dir) / "pkg" / "a.py").write_text("import os\n", encoding="utf-8")
+        for path in (Path(self.test_dir), Path(self.test_dir) / "pkg"):
+            os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        cache_home = Path(self.test_dir) / "cache"
+        args = [str(Path(self.test_dir) / "pkg"), "--force", "--emit", "--map-dependencies"]
+
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": str(cache_home)}):
+            result = self.runner.invoke(cli, args + ["--no-cache"])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertFalse(cache_home.exists())
+
+            result = self.runner.invoke(cli, args)
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertTrue(any(p.is_file() for p in cache_home.rglob("*")))
+
     def test_help_short_flag(self):
         result = self.runner.invoke(cli, ["-h"])
 
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Usage:", result.output)
 
+    def test_collect_python_files_in_tree_order(self):
+        def node(name, children=None):
+            kind = NodeType.DIRECTORY if children is not None else NodeType.FILE
+            return FileNode(name=name, path=name, node_type=kind, children=children)
+
+        tree = [
+            node("a.py"),
+            node("pkg", [node("b.py"), node("sub", [node("c.py")]), node("d.py")]),
+            node("notes.txt"),
+            node("e.py"),
+        ]
+
+        self.assertEqual(_collect_python_files(tree), ["a.py", "b.py", "c.py", "d.py", "e.py"])
+
+    def test_textual_loaded_only_for_interactive_runs(self):
+        check = "import sys, gitex.main; sys.exit('textual' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, "-c", check]).returncode, 0)
+
+        with patch("gitex.picker.textuals.TextualPicker") as MockPicker:
+            MockPicker.return_value.pick.return_value = []
+            result = self.runner.invoke(cli, [str(self.test_dir), "-i", "--force"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        MockPicker.return_value.pick.assert_called_once()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
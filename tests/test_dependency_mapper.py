@@ -0,0 +1,453 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from gitex import dependency_mapper
+from gitex.dependency_mapper import DependencyMapper, format_dependency_analysis
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory, monkeypatch):
+    """Keep the analysis cache out of the user's home directory."""
+    cache_home = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path):
+    """
+    Create a small Python project:
+    pkg/
+    ├── __init__.py
+    ├── base.py        (Base <- Child <- GrandChild, module function util)
+    └── sub/
+        ├── __init__.py
+        └── helpers.py (Other extends pkg.base.Base, calls Base.run)
+    """
+    def write(relpath: str, content: str):
+        p = tmp_path / relpath
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content, encoding="utf-8")
+
+    write("pkg/__init__.py", "")
+    write("pkg/sub/__init__.py", "")
+    write(
+        "pkg/base.py",
+        "import os\n"
+        "from pkg.sub import helpers\n"
+        "\n"
+        "class Base:\n"
+        "    def run(self):\n"
+        "        self.step()\n"
+        "        return os.getcwd()\n"
+        "\n"
+        "    def step(self):\n"
+        "        pass\n"
+        "\n"
+        "class Child(Base):\n"
+        "    def step(self):\n"
+        "        self.run()\n"
+        "\n"
+        "class GrandChild(Child):\n"
+        "    pass\n"
+        "\n"
+        "def util():\n"
+        "    return helper()\n"
+        "\n"
+        "def helper():\n"
+        "    return 1\n",
+    )
+    write(
+        "pkg/sub/helpers.py",
+        "import json\n"
+        "from pkg.base import Base\n"
+        "\n"
+        "class Other(Base):\n"
+        "    def go(self):\n"
+        "        Base.run(self)\n",
+    )
+    return tmp_path
+
+
+def analyze(project_dir: Path):
+    return DependencyMapper(str(project_dir)).analyze()
+
+
+def cached_analyze(project_dir: Path):
+    return DependencyMapper(str(project_dir), use_cache=True).analyze()
+
+
+def test_inheritance_tree(project_dir):
+    analysis = analyze(project_dir)
+
+    base_children = analysis.inheritance_tree["pkg/base.py::Base"]
+    assert sorted(base_children) == ["pkg/base.py::Child", "pkg/sub/helpers.py::Other"]
+    assert analysis.inheritance_tree["pkg/base.py::Child"] == ["pkg/base.py::GrandChild"]
+
+
+def test_same_class_method_calls(project_dir):
+    analysis = analyze(project_dir)
+
+    assert analysis.function_call_graph["pkg/base.py::Base.run"] == {"pkg/base.py::Base.step"}
+    # Child.step calls self.run(), which is only defined on Base
+    assert "pkg/base.py::Child.step" not in analysis.function_call_graph
+
+
+def test_same_file_function_calls(project_dir):
+    analysis = analyze(project_dir)
+
+    assert analysis.function_call_graph["pkg/base.py::.util"] == {"pkg/base.py::.helper"}
+    assert analysis.functions["pkg/base.py::.helper"].called_by == {"pkg/base.py::.util"}
+
+
+def test_cross_file_qualified_calls(project_dir):
+    analysis = analyze(project_dir)
+
+    assert analysis.function_call_graph["pkg/sub/helpers.py::Other.go"] == {"pkg/base.py::Base.run"}
+    assert "pkg/sub/helpers.py::Other.go" in analysis.functions["pkg/base.py::Base.run"].called_by
+
+
+def test_format_dependency_analysis(project_dir):
+    output = format_dependency_analysis(analyze(project_dir))
+
+    assert "## 📦 Import Dependencies" in output
+    assert "  Internal: pkg.sub" in output
+    assert "  External: os" in output
+    assert "**Base** (pkg/base.py)" in output
+    assert "  ├── **Child** (pkg/base.py) extends Base" in output
+    assert "    ├── **GrandChild** (pkg/base.py) extends Child" in output
+    assert "Other.go() → Base.run() [pkg/base.py]" in output
+    assert "- **Classes found**: 4" in output
+
+
+def test_base_class_prefers_same_file_definition(tmp_path):
+    (tmp_path / "a.py").write_text("class Base:\n    pass\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("class Base:\n    pass\nclass Child(Base):\n    pass\n", encoding="utf-8")
+    (tmp_path / "c.py").write_text("class Other(Base):\n    pass\n", encoding="utf-8")
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    assert analysis.inheritance_tree["b.py::Base"] == ["b.py::Child"]
+    # Not defined locally: falls back to the first definition
+    assert analysis.inheritance_tree["a.py::Base"] == ["c.py::Other"]
+
+
+def test_nested_function_calls_belong_to_inner_function(tmp_path):
+    (tmp_path / "mod.py").write_text(
+        "def outer():\n"
+        "    def inner():\n"
+        "        deep()\n"
+        "    shallow()\n"
+        "    return inner()\n",
+        encoding="utf-8",
+    )
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    assert analysis.functions["mod.py::.outer"].calls == {"inner", "shallow"}
+    assert analysis.functions["mod.py::.inner"].calls == {"deep"}
+
+
+def test_decorator_and_default_calls_belong_to_enclosing_scope(tmp_path):
+    (tmp_path / "mod.py").write_text(
+        "def outer():\n"
+        "    @wrap(tag())\n"
+        "    def inner(x=default()) -> hint():\n"
+        "        body()\n"
+        "def top(y=module_default()):\n"
+        "    pass\n",
+        encoding="utf-8",
+    )
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    assert analysis.functions["mod.py::.outer"].calls == {"wrap", "tag", "default", "hint"}
+    assert analysis.functions["mod.py::.inner"].calls == {"body"}
+    assert analysis.functions["mod.py::.top"].calls == set()
+
+
+def test_parallel_analysis_matches_sequential(tmp_path, monkeypatch):
+    for i in range(dependency_mapper.PARALLEL_THRESHOLD + 8):
+        (tmp_path / f"mod{i}.py").write_text(
+            f"import json\n"
+            f"from mod{(i + 1) % 5} import f{(i + 1) % 5}\n"
+            f"class C{i}(C{max(i - 1, 0)}):\n"
+            f"    def m(self):\n"
+            f"        self.n()\n"
+            f"    def n(self):\n"
+            f"        pass\n"
+            f"def f{i}():\n"
+            f"    return C{i}.m(None)\n",
+            encoding="utf-8",
+        )
+
+    monkeypatch.setattr(dependency_mapper.os, "cpu_count", lambda: 2)
+    # Uncached, so the sequential run parses everything itself instead of loading the parallel results
+    parallel = format_dependency_analysis(DependencyMapper(str(tmp_path), use_cache=False).analyze())
+
+    parsed = []
+    real_parse = dependency_mapper._parse_source
+    monkeypatch.setattr(dependency_mapper, "_parse_source", lambda *args: parsed.append(args) or real_parse(*args))
+    monkeypatch.setattr(dependency_mapper, "PARALLEL_THRESHOLD", 10**9)
+    sequential = format_dependency_analysis(DependencyMapper(str(tmp_path), use_cache=False).analyze())
+
+    assert len(parsed) == 40
+    assert parallel == sequential
+    assert "- **Files analyzed**: 40" in parallel
+
+
+def test_dotted_bases_and_chained_calls(tmp_path):
+    (tmp_path / "mod.py").write_text(
+        "import pkg.base\n"
+        "class Other(pkg.base.Base):\n"
+        "    def go(self):\n"
+        "        self.run()\n"
+        "        os.path.join('a')\n"
+        "        make().build()\n",
+        encoding="utf-8",
+    )
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    assert analysis.classes["mod.py::Other"].bases == ["pkg.base.Base"]
+    assert analysis.functions["mod.py::Other.go"].calls == {"run", "os.path.join", "make"}
+
+
+def test_cache_reuses_results_for_unchanged_files(project_dir, cache_home, monkeypatch):
+    first = format_dependency_analysis(cached_analyze(project_dir))
+    assert list((cache_home / "gitex" / "dependencies").glob("*.pkl"))
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("unchanged file was re-parsed")
+
+    monkeypatch.setattr(dependency_mapper, "_parse_source", fail_parse)
+    assert format_dependency_analysis(cached_analyze(project_dir)) == first
+
+
+def test_cache_reuses_results_for_touched_and_moved_files(project_dir, monkeypatch):
+    cached_analyze(project_dir)
+    helpers = project_dir / "pkg" / "sub" / "helpers.py"
+    st = helpers.stat()
+    os.utime(helpers, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    (project_dir / "pkg" / "base.py").rename(project_dir / "pkg" / "core.py")
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("file with unchanged content was re-parsed")
+
+    monkeypatch.setattr(dependency_mapper, "_parse_source", fail_parse)
+    analysis = cached_analyze(project_dir)
+
+    assert analysis.classes["pkg/core.py::Base"].file_path == "pkg/core.py"
+    assert "pkg/base.py::Base" not in analysis.classes
+    assert "pkg/sub/helpers.py::Other" in analysis.classes
+
+
+def test_cache_invalidated_when_file_changes(project_dir):
+    cached_analyze(project_dir)
+    (project_dir / "pkg" / "sub" / "helpers.py").write_text(
+        "class Renamed:\n    pass\n", encoding="utf-8"
+    )
+    analysis = cached_analyze(project_dir)
+
+    assert "pkg/sub/helpers.py::Renamed" in analysis.classes
+    assert "pkg/sub/helpers.py::Other" not in analysis.classes
+
+
+def test_cache_refreshes_internal_imports(project_dir):
+    base_py = str(project_dir / "pkg" / "base.py")
+    DependencyMapper(str(project_dir), use_cache=True).analyze([base_py])
+
+    # Cached when pkg.sub was not part of the run; now it is
+    analysis = cached_analyze(project_dir)
+    imports = {imp.module: imp.is_external for imp in analysis.imports["pkg/base.py"]}
+    assert imports == {"os": True, "pkg.sub": False}
+
+
+def test_cache_disabled(project_dir, cache_home):
+    DependencyMapper(str(project_dir), use_cache=False).analyze()
+    assert not (cache_home / "gitex").exists()
+
+    # Library callers opt in; only the CLI caches by default
+    analyze(project_dir)
+    assert not (cache_home / "gitex").exists()
+
+
+def test_undecodable_and_declared_encodings(tmp_path):
+    (tmp_path / "binary.py").write_bytes(b"\xff\xfe\x00junk")
+    (tmp_path / "latin.py").write_bytes(b"# -*- coding: latin-1 -*-\ndef caf\xe9():\n    pass\n")
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    assert "binary.py" not in analysis.imports
+    assert "latin.py::.café" in analysis.functions
+
+
+def test_deep_and_cyclic_inheritance(tmp_path):
+    depth = 1500
+    lines = ["class C0:\n    pass\n"]
+    lines += [f"class C{i}(C{i - 1}):\n    pass\n" for i in range(1, depth)]
+    # B and D inherit from each other below A
+    lines.append("class A:\n    pass\nclass B(A, D):\n    pass\nclass D(B):\n    pass\n")
+    (tmp_path / "mod.py").write_text("".join(lines), encoding="utf-8")
+
+    output = format_dependency_analysis(DependencyMapper(str(tmp_path)).analyze(), "inheritance")
+
+    assert f"{'  ' * (depth - 1)}├── **C{depth - 1}** (mod.py) extends C{depth - 2}" in output
+    assert "**A** (mod.py)\n  ├── **B** (mod.py) extends A, D\n    ├── **D** (mod.py) extends B\n\n" in output
+
+
+def test_submodule_of_project_package_is_internal(tmp_path):
+    (tmp_path / "mypkg").mkdir()
+    (tmp_path / "mypkg" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "mypkg" / "util.py").write_text("", encoding="utf-8")
+    (tmp_path / "main.py").write_text("import mypkg.util\nimport os.path\n", encoding="utf-8")
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    imports = {imp.module: imp.is_external for imp in analysis.imports["main.py"]}
+    assert imports == {"mypkg.util": False, "os.path": True}
+
+
+def test_missing_submodule_of_project_package_is_external(tmp_path):
+    (tmp_path / "mypkg").mkdir()
+    (tmp_path / "mypkg" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "main.py").write_text(
+        "import mypkg.nonexistent\nfrom mypkg.nonexistent import x\nfrom mypkg import name\n", encoding="utf-8"
+    )
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    imports = [(imp.module, imp.is_external) for imp in analysis.imports["main.py"]]
+    assert imports == [("mypkg.nonexistent", True), ("mypkg.nonexistent", True), ("mypkg", False)]
+
+
+def test_deep_attribute_import_of_project_module_is_internal(tmp_path):
+    (tmp_path / "mypkg" / "sub").mkdir(parents=True)
+    (tmp_path / "mypkg" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "mypkg" / "sub" / "base.py").write_text("class Foo:\n    pass\n", encoding="utf-8")
+    (tmp_path / "main.py").write_text(
+        "import mypkg.sub.base.Foo\nfrom mypkg.sub.base import Foo\nimport mypkgx\n", encoding="utf-8"
+    )
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    imports = [(imp.module, imp.is_external) for imp in analysis.imports["main.py"]]
+    assert imports == [("mypkg.sub.base.Foo", False), ("mypkg.sub.base", False), ("mypkgx", True)]
+
+
+def test_discovery_prunes_vcs_and_virtualenv_dirs(tmp_path):
+    for relpath in ["app.py", "pkg/mod.py", ".venv/lib/site.py", "venv/x.py", ".git/hook.py", "node_modules/n.py"]:
+        p = tmp_path / relpath
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("import json\n", encoding="utf-8")
+
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    assert sorted(analysis.imports) == ["app.py", "pkg/mod.py"]
+
+
+def test_discovery_keeps_build_and_dist_packages(tmp_path):
+    for relpath in [
+        "app.py", "build/lib/app.py", "dist/x.py", "docs/build/conf.py",
+        "mypkg/__init__.py", "mypkg/build/__init__.py", "mypkg/build/steps.py", "mypkg/dist/__init__.py",
+    ]:
+        p = tmp_path / relpath
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("import json\n", encoding="utf-8")
+
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    assert sorted(analysis.imports) == [
+        "app.py", "mypkg/__init__.py", "mypkg/build/__init__.py", "mypkg/build/steps.py", "mypkg/dist/__init__.py",
+    ]
+
+
+def test_discovery_skips_gitignored_paths(tmp_path):
+    (tmp_path / ".gitignore").write_text("generated/\n*_pb2.py\n", encoding="utf-8")
+    for relpath in ["app.py", "pkg/api_pb2.py", "generated/out.py", "pkg/generated/deep.py"]:
+        p = tmp_path / relpath
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("import json\n", encoding="utf-8")
+
+    assert sorted(DependencyMapper(str(tmp_path)).analyze().imports) == ["app.py"]
+
+    unfiltered = DependencyMapper(str(tmp_path), respect_gitignore=False).analyze()
+    assert len(unfiltered.imports) == 4
+
+
+def test_identical_files_are_parsed_once(tmp_path, monkeypatch):
+    source = "class Vendored:\n    def run(self):\n        self.step()\n    def step(self):\n        pass\n"
+    for relpath in ["a/vendored.py", "b/vendored.py"]:
+        p = tmp_path / relpath
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(source, encoding="utf-8")
+
+    parse_calls = []
+    real_parse = dependency_mapper._parse_source
+    monkeypatch.setattr(dependency_mapper, "_parse_source", lambda *a: parse_calls.append(a) or real_parse(*a))
+
+    analysis = DependencyMapper(str(tmp_path), use_cache=False).analyze()
+
+    assert len(parse_calls) == 1
+    for rel in ["a/vendored.py", "b/vendored.py"]:
+        assert analysis.classes[f"{rel}::Vendored"].file_path == rel
+        assert analysis.functions[f"{rel}::Vendored.step"].called_by == {f"{rel}::Vendored.run"}
+
+
+@pytest.mark.parametrize("focus,included", [
+    ("imports", "## 📦 Import Dependencies"),
+    ("inheritance", "## 🏗️ Class Inheritance Hierarchy"),
+    ("calls", "## 🔄 Function Call Relationships"),
+])
+def test_format_focus_renders_single_section(project_dir, focus, included):
+    output = format_dependency_analysis(analyze(project_dir), focus)
+
+    headers = [line for line in output.splitlines() if line.startswith("## ")]
+    assert headers == [included, "## 📊 Summary Statistics"]
+
+
+def test_oversized_and_generated_files_are_skipped(tmp_path):
+    (tmp_path / "app.py").write_text("import json\n", encoding="utf-8")
+    (tmp_path / "tables.py").write_text("import array\nTABLE = [\n" + "    0,\n" * 200 + "]\n", encoding="utf-8")
+    (tmp_path / "msg_pb2.py").write_text(
+        "# Generated by the protocol buffer compiler.  DO NOT EDIT!\nimport google.protobuf\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "stub.py").write_text("# @generated by tool\nimport os\n", encoding="utf-8")
+
+    analysis = DependencyMapper(str(tmp_path), max_file_size=1000).analyze()
+    assert sorted(analysis.imports) == ["app.py"]
+
+    analysis = DependencyMapper(str(tmp_path), max_file_size=None).analyze()
+    assert sorted(analysis.imports) == ["app.py", "tables.py"]
+
+
+def test_generated_marker_outside_leading_comments_is_ignored(tmp_path):
+    (tmp_path / "docs.py").write_text('"""Skips files marked @generated."""\nimport os\n', encoding="utf-8")
+    (tmp_path / "late.py").write_text("# Tooling helpers\nimport os\n# never @generated\n", encoding="utf-8")
+    (tmp_path / "header.py").write_text("#!/usr/bin/env python\n\n# @generated by tool\nimport os\n", encoding="utf-8")
+
+    analysis = DependencyMapper(str(tmp_path)).analyze()
+
+    assert sorted(analysis.imports) == ["docs.py", "late.py"]
+
+
+def test_files_without_definitions_are_not_parsed(tmp_path, monkeypatch):
+    (tmp_path / "data.py").write_text("VALUES = [1, 2, 3]\n", encoding="utf-8")
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("file without imports or definitions was parsed")
+
+    monkeypatch.setattr(dependency_mapper, "_parse_source", fail_parse)
+    analysis = DependencyMapper(str(tmp_path), use_cache=False).analyze()
+
+    assert "data.py" not in analysis.imports
+
+
+def test_parallel_analysis_reports_failed_files(tmp_path, monkeypatch, capsys):
+    paths = []
+    for i in range(dependency_mapper.PARALLEL_THRESHOLD):
+        p = tmp_path / f"mod{i}.py"
+        p.write_text("import json\n", encoding="utf-8")
+        paths.append(str(p))
+    paths.insert(5, str(tmp_path / "missing.py"))
+
+    monkeypatch.setattr(dependency_mapper.os, "cpu_count", lambda: 2)
+    analysis = DependencyMapper(str(tmp_path)).analyze(paths)
+
+    assert "Warning: Failed to analyze" in capsys.readouterr().out
+    assert len(analysis.imports) == dependency_mapper.PARALLEL_THRESHOLD
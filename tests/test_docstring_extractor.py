@@ -0,0 +1,109 @@
+import ast
+
+import pytest
+
+from gitex import docstring_extractor
+from gitex.docstring_extractor import _unparse, extract_docstrings
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    home = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(home))
+    return home
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text(
+        '"""Module doc."""\n'
+        "class Greeter:\n"
+        '    """Says hello."""\n'
+        "    def greet(self, name: str) -> str:\n"
+        '        """Greet someone."""\n'
+        "        return name\n"
+    )
+    return path
+
+
+def _count_parses(monkeypatch):
+    calls = []
+    real_parse = docstring_extractor.ast.parse
+
+    def counting_parse(*args, **kwargs):
+        calls.append(args)
+        return real_parse(*args, **kwargs)
+
+    monkeypatch.setattr(docstring_extractor.ast, "parse", counting_parse)
+    return calls
+
+
+def test_extracts_signatures_and_docstrings(source_file):
+    out = extract_docstrings(source_file)
+    assert '"""Module doc."""' in out
+    assert "class Greeter:" in out
+    assert "def greet(self, name: str) -> str:" in extract_docstrings(source_file, "mod.Greeter")
+
+
+def test_cache_reuses_unchanged_file(source_file, monkeypatch, cache_home):
+    first = extract_docstrings(source_file, use_cache=True)
+    assert any((cache_home / "gitex" / "docstrings").iterdir())
+
+    calls = _count_parses(monkeypatch)
+    assert extract_docstrings(source_file, use_cache=True) == first
+    assert calls == []
+
+
+def test_cache_keyed_by_content_and_options(source_file, monkeypatch):
+    extract_docstrings(source_file, use_cache=True)
+    calls = _count_parses(monkeypatch)
+
+    assert "Greet someone" not in extract_docstrings(source_file, "mod.Greeter.missing", use_cache=True)
+    source_file.write_text('def added():\n    """New."""\n')
+    assert "def added()" in extract_docstrings(source_file, use_cache=True)
+    assert len(calls) == 2
+
+
+def test_cache_disabled_writes_nothing(source_file, cache_home):
+    extract_docstrings(source_file, use_cache=False)
+    extract_docstrings(source_file)
+    assert not (cache_home / "gitex" / "docstrings").exists()
+
+
+def test_syntax_errors_not_cached(tmp_path, cache_home):
+    path = tmp_path / "broken.py"
+    path.write_text("def broken(:\n")
+    assert "SyntaxError" in extract_docstrings(path, use_cache=True)
+    assert not (cache_home / "gitex" / "docstrings").exists()
+
+
+def test_declared_encoding_is_honoured(tmp_path):
+    path = tmp_path / "latin.py"
+    path.write_bytes(b'# -*- coding: latin-1 -*-\ndef caf():\n    """Caf\xe9."""\n')
+    assert '"""Café."""' in extract_docstrings(path, include_empty_classes=True)
+
+
+def test_undecodable_file_reported(tmp_path):
+    path = tmp_path / "junk.py"
+    path.write_bytes(b'x = "\xff\xfe"\n')
+    assert extract_docstrings(path) == f"Could not decode file: {path}\n"
+
+
+def test_symbol_path_resolves_nested_definitions(source_file):
+    out = extract_docstrings(source_file, "mod.Greeter.greet")
+    assert out == 'def greet(self, name: str) -> str:\n    """Greet someone."""'
+    assert "not found" in extract_docstrings(source_file, "mod.Missing.greet")
+
+
+def test_module_qualified_symbol_skips_unmatched_package_parts(source_file):
+    """A dotted package prefix that doesn't match the file's location is skipped."""
+    expected = 'def greet(self, name: str) -> str:\n    """Greet someone."""'
+    assert extract_docstrings(source_file, "pkg.other.Greeter.greet") == expected
+    assert extract_docstrings(source_file, "pkg.mod.Greeter.greet") == expected
+
+
+@pytest.mark.parametrize("source", ["a", "a.b.c", "(a + b).x", "f().x", "(1).real", "x[int]", "a.b[c].d"])
+def test_unparse_shortcut_matches_ast_unparse(source):
+    node = ast.parse(source, mode="eval").body
+    assert _unparse(node) == ast.unparse(node)
@@ -0,0 +1,27 @@
+from dataclasses import replace
+
+from gitex.models import FileNode, NodeType
+
+
+def test_node_type_stored_as_plain_string():
+    node = FileNode(name="a.py", path="root/a.py", node_type=NodeType.FILE)
+    assert node.node_type == "file" and type(node.node_type) is str
+
+
+def test_replace_keeps_fields_and_swaps_children():
+    child = FileNode(name="a.py", path="root/a.py", node_type="file")
+    root = FileNode(name=".", path="root", node_type="directory", children=[child], is_selected=False)
+
+    pruned = replace(root, children=[])
+
+    assert pruned.children == [] and root.children == [child]
+    assert (pruned.name, pruned.path, pruned.node_type, pruned.is_selected) == (".", "root", "directory", False)
+
+
+def test_metadata_defaults_to_a_fresh_dict():
+    a = FileNode(name="a.py", path="root/a.py", node_type="file")
+    b = FileNode(name="b.py", path="root/b.py", node_type="file")
+
+    a.metadata["size"] = 1
+
+    assert a.metadata == {"size": 1} and b.metadata == {}
@@ -0,0 +1,279 @@
+import os
+
+import pytest
+from git import Repo
+
+from gitex.picker import base
+from gitex.picker.base import DefaultPicker, GitignoreSpec
+from gitex.picker.gitfiles import GitPicker
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory, monkeypatch):
+    """Keep the listing cache out of the user's home directory."""
+    cache_home = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
+
+
+def _names(node):
+    return [child.name for child in node.children]
+
+
+def test_gitignore_spec_compiled_once_per_root(tmp_path, monkeypatch):
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "app.py").write_text("")
+    (tmp_path / "debug.log").write_text("")
+
+    compiled = []
+    real_from_lines = base.pathspec.PathSpec.from_lines
+
+    def counting_from_lines(*args, **kwargs):
+        compiled.append(args)
+        return real_from_lines(*args, **kwargs)
+
+    monkeypatch.setattr(base.pathspec.PathSpec, "from_lines", counting_from_lines)
+
+    for _ in range(2):
+        root = DefaultPicker(respect_gitignore=True).pick(str(tmp_path))[0]
+        assert _names(root) == ["app.py"]
+    assert len(compiled) == 1
+
+
+def test_gitignore_edits_are_picked_up(tmp_path):
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_text("*.log\n")
+    (tmp_path / "debug.log").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+
+    picker = DefaultPicker(respect_gitignore=True)
+    assert _names(picker.pick(str(tmp_path))[0]) == ["notes.txt"]
+
+    gitignore.write_text("*.txt\n*.tmp\n")
+    assert _names(picker.pick(str(tmp_path))[0]) == ["debug.log"]
+
+
+@pytest.mark.parametrize("path", [
+    "debug.log", "logs/keep.log", "keep.log/inner.txt", "build/out.o", "src/build",
+    "top", "src/top", "a/x/y/b", "mod.pyc", "important/mod.pyc", "dist/keep", "dist/other",
+])
+def test_gitignore_spec_matches_like_pathspec(path):
+    lines = ["*.log", "!keep.log", "build/", "/top", "a/**/b", "*.py[cod]", "!important/*.pyc", "dist", "!dist/keep"]
+    spec = base.pathspec.PathSpec.from_lines("gitwildmatch", lines)
+    assert GitignoreSpec(spec).match_file(path) == spec.match_file(path)
+
+
+def test_default_picker_follows_symlinked_dirs(tmp_path):
+    (tmp_path / "real").mkdir()
+    (tmp_path / "real" / "mod.py").write_text("")
+    (tmp_path / "link").symlink_to(tmp_path / "real", target_is_directory=True)
+    (tmp_path / "broken").symlink_to(tmp_path / "missing")
+
+    root = DefaultPicker().pick(str(tmp_path))[0]
+
+    assert [(c.name, c.node_type) for c in root.children] == [
+        ("broken", "file"), ("link", "directory"), ("real", "directory"),
+    ]
+    assert _names(root.children[1]) == ["mod.py"]
+
+
+def test_default_picker_skips_excluded_names_without_walking_them(tmp_path, monkeypatch):
+    for relpath in ["pkg/mod.py", "pkg/__pycache__/mod.pyc", "gitex.egg-info/PKG-INFO", ".git/HEAD"]:
+        (tmp_path / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relpath).write_text("")
+
+    walked = []
+    real_scandir = base.os.scandir
+
+    def recording_scandir(path):
+        walked.append(os.path.basename(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(base.os, "scandir", recording_scandir)
+    picker = DefaultPicker(ignore_hidden=False, exclude_patterns=[".git", "*.egg-info", "__pycache__"])
+    root = picker.pick(str(tmp_path))[0]
+
+    assert _names(root) == ["pkg"]
+    assert _names(root.children[0]) == ["mod.py"]
+    assert sorted(walked) == sorted([tmp_path.name, "pkg"])
+
+
+def test_listing_cache_reuses_unchanged_directories(tmp_path, monkeypatch):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("")
+    (tmp_path / "app.py").write_text("")
+    # Listings modified within the last couple of seconds are never cached
+    for path in (tmp_path, tmp_path / "pkg"):
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    DefaultPicker(use_cache=True).pick(str(tmp_path))
+
+    scanned = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        scanned.append(os.path.basename(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    root = DefaultPicker(use_cache=True).pick(str(tmp_path))[0]
+    assert scanned == []
+    assert _names(root) == ["app.py", "pkg"] and _names(root.children[1]) == ["mod.py"]
+
+    (tmp_path / "pkg" / "new.py").write_text("")
+    root = DefaultPicker(use_cache=True).pick(str(tmp_path))[0]
+    assert scanned == ["pkg"]
+    assert _names(root.children[1]) == ["mod.py", "new.py"]
+
+
+def test_parallel_listing_matches_serial_walk(tmp_path):
+    for relpath in ["a/b/c/deep.py", "a/one.py", "d/two.py", "d/e/three.txt", "pkg/__pycache__/x.pyc", "top.py"]:
+        (tmp_path / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relpath).write_text("")
+    (tmp_path / "link").symlink_to(tmp_path / "d", target_is_directory=True)
+
+    def pick(**kwargs):
+        picker = DefaultPicker(exclude_patterns=["__pycache__"], use_cache=False, **kwargs)
+        return list(_paths(picker.pick(str(tmp_path))[0]))
+
+    assert pick(max_workers=4) == pick()
+    assert "link/e/three.txt" in pick(max_workers=4)
+
+
+def test_pick_shallow_expands_to_the_full_tree(tmp_path):
+    for relpath in ["pkg/sub/deep.py", "pkg/mod.py", "pkg/__pycache__/x.pyc", "top.py", ".hidden/h.py"]:
+        (tmp_path / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relpath).write_text("")
+    picker = DefaultPicker(exclude_patterns=["__pycache__"], use_cache=False)
+
+    root = picker.pick_shallow(str(tmp_path))[0]
+    pkg = root.children[0]
+    assert _names(root) == ["pkg", "top.py"] and pkg.children is None
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.node_type == "directory" and node.children is None:
+            picker.expand(node, str(tmp_path))
+        stack.extend(node.children or [])
+    assert root == picker.pick(str(tmp_path))[0]
+
+
+def _paths(node, prefix=""):
+    for child in node.children or []:
+        rel = f"{prefix}{child.name}"
+        if child.node_type == "directory":
+            yield f"{rel}/"
+            yield from _paths(child, f"{rel}/")
+        else:
+            yield rel
+
+
+def test_git_picker_lists_tracked_and_unignored_files(tmp_path):
+    repo = Repo.init(tmp_path)
+    for relpath, content in {
+        "app.py": "",
+        "gone.py": "",
+        "pkg/mod.py": "",
+        "pkg/.gitignore": "*.log\n",
+        ".hidden": "",
+    }.items():
+        p = tmp_path / relpath
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content)
+    repo.index.add(["app.py", "gone.py", "pkg/mod.py", "pkg/.gitignore"])
+    (tmp_path / "gone.py").unlink()
+    (tmp_path / "pkg" / "new.py").write_text("")
+    (tmp_path / "pkg" / "debug.log").write_text("")
+
+    root = GitPicker().pick(str(tmp_path))[0]
+
+    assert root.name == "." and root.path == str(tmp_path)
+    assert list(_paths(root)) == ["app.py", "pkg/", "pkg/mod.py", "pkg/new.py"]
+    assert ".hidden" in list(_paths(GitPicker(ignore_hidden=False).pick(str(tmp_path))[0]))
+
+
+def test_git_picker_skips_excluded_names(tmp_path):
+    Repo.init(tmp_path)
+    for relpath in ["pkg/mod.py", "pkg/__pycache__/mod.pyc", "gitex.egg-info/PKG-INFO"]:
+        (tmp_path / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relpath).write_text("")
+
+    picker = GitPicker(ignore_hidden=False, exclude_patterns=[".git", "*.egg-info", "__pycache__"])
+    root = picker.pick(str(tmp_path))[0]
+
+    assert list(_paths(root)) == ["pkg/", "pkg/mod.py"]
+
+
+def test_git_picker_walks_nested_repositories(tmp_path):
+    Repo.init(tmp_path)
+    (tmp_path / "top.py").write_text("")
+    Repo.init(tmp_path / "vendor")
+    (tmp_path / "vendor" / "lib.py").write_text("")
+
+    root = GitPicker().pick(str(tmp_path))[0]
+
+    assert list(_paths(root)) == ["top.py", "vendor/", "vendor/lib.py"]
+
+
+def test_git_picker_walks_nested_repositories_in_parallel(tmp_path, monkeypatch):
+    Repo.init(tmp_path)
+    (tmp_path / "top.py").write_text("")
+    Repo.init(tmp_path / "vendor")
+    (tmp_path / "vendor" / "pkg").mkdir()
+    (tmp_path / "vendor" / "pkg" / "lib.py").write_text("")
+
+    prefetched = []
+    real_prefetch = DefaultPicker._prefetch
+
+    def recording_prefetch(self, path, root_path):
+        prefetched.append(path)
+        return real_prefetch(self, path, root_path)
+
+    monkeypatch.setattr(DefaultPicker, "_prefetch", recording_prefetch)
+    root = GitPicker(max_workers=4).pick(str(tmp_path))[0]
+
+    assert prefetched == [str(tmp_path / "vendor")]
+    assert list(_paths(root)) == ["top.py", "vendor/", "vendor/pkg/", "vendor/pkg/lib.py"]
+
+
+def test_git_picker_follows_symlinked_directories(tmp_path):
+    repo = Repo.init(tmp_path)
+    (tmp_path / "real").mkdir()
+    (tmp_path / "real" / "a.py").write_text("")
+    (tmp_path / "link").symlink_to("real")
+    (tmp_path / "untracked_link").symlink_to("real")
+    (tmp_path / "file_link.py").symlink_to(tmp_path / "real" / "a.py")
+    repo.index.add(["real/a.py", "link", "file_link.py"])
+
+    root = GitPicker().pick(str(tmp_path))[0]
+
+    assert list(_paths(root)) == [
+        "file_link.py", "link/", "link/a.py", "real/", "real/a.py", "untracked_link/", "untracked_link/a.py",
+    ]
+
+
+def test_git_picker_lists_an_ignored_directory_it_is_pointed_at(tmp_path):
+    Repo.init(tmp_path)
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "build" / "lib").mkdir(parents=True)
+    (tmp_path / "build" / "out.py").write_text("")
+    (tmp_path / "build" / "lib" / "mod.py").write_text("")
+
+    assert list(_paths(GitPicker().pick(str(tmp_path))[0])) == []
+    assert list(_paths(GitPicker().pick(str(tmp_path / "build"))[0])) == ["lib/", "lib/mod.py", "out.py"]
+    assert list(_paths(GitPicker().pick(str(tmp_path / "build" / "lib"))[0])) == ["mod.py"]
+
+
+def test_git_picker_keeps_tracked_ignored_files_and_drops_empty_directories(tmp_path):
+    repo = Repo.init(tmp_path)
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "tracked.log").write_text("")
+    (tmp_path / "untracked.log").write_text("")
+    (tmp_path / "app.py").write_text("")
+    (tmp_path / "empty").mkdir()
+    repo.index.add(["tracked.log"])
+
+    root = GitPicker().pick(str(tmp_path))[0]
+
+    # Like git itself: ignore rules only apply to untracked files, and git has no empty directories
+    assert list(_paths(root)) == ["app.py", "tracked.log"]
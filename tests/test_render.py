@@ -145,6 +145,22 @@ def test_read_file_exception_handling():
         output = renderer.render_files()
         assert "<Error reading file: Permission denied>" in output
 
+def test_threaded_reads_keep_file_order(tmp_path):
+    """Test that reading ahead on a thread pool renders the same blocks in the same order."""
+    nodes = []
+    for i in range(20):
+        path = tmp_path / f"mod{i:02}.py"
+        path.write_text(f"x = {i}\n")
+        nodes.append(MockFileNode(path.name, str(path), "file"))
+    nodes.append(MockFileNode("missing.py", str(tmp_path / "missing.py"), "file"))
+    root = [MockFileNode(".", str(tmp_path), "directory", children=nodes)]
+
+    serial = Renderer(root).render_files(str(tmp_path))
+    threaded = Renderer(root, max_workers=3).render_files(str(tmp_path))
+
+    assert threaded == serial
+    assert serial.index("x = 3") < serial.index("x = 12") < serial.index("<Error reading file")
+
 # --- Tests for Helper Functions ---
 
 def test_is_binary_file():
@@ -0,0 +1,12 @@
+import ast
+
+from gitex.slicer import get_used_names
+
+
+def test_get_used_names_collects_nested_names():
+    tree = ast.parse(
+        "class Child(Base):\n"
+        "    def run(self, x: Config) -> None:\n"
+        "        helper(x).attr = [item for item in VALUES]\n"
+    )
+    assert get_used_names(tree.body[0]) == {"Base", "Config", "helper", "x", "item", "VALUES"}
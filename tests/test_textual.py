@@ -1,11 +1,21 @@
+import os
 import pytest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from textual.widgets import Tree
 from gitex.models import FileNode, NodeType
+from gitex.picker.base import DefaultPicker
 from gitex.picker.textuals import TextualPicker, _PickerApp
 
 # --- Fixtures ---
 
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory, monkeypatch):
+    """Keep anything the pickers cache out of the user's home directory."""
+    cache_home = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
+
+
 @pytest.fixture
 def mock_file_tree():
     """
@@ -41,7 +51,7 @@ def test_textual_picker_pick_calls_app(mock_file_tree):
     """Test that the wrapper class initializes the App and returns selected nodes."""
     picker = TextualPicker(ignore_hidden=True)
     
-    with patch("gitex.picker.textuals.DefaultPicker.pick", return_value=mock_file_tree):
+    with patch("gitex.picker.textuals.DefaultPicker.pick_shallow", return_value=mock_file_tree):
         with patch("gitex.picker.textuals._PickerApp") as MockApp:
             mock_app_instance = MockApp.return_value
             mock_app_instance.run.return_value = None
@@ -50,7 +60,7 @@ def test_textual_picker_pick_calls_app(mock_file_tree):
             result = picker.pick("root")
             
             assert result == ["result_node"]
-            MockApp.assert_called_once_with(mock_file_tree)
+            MockApp.assert_called_once_with(mock_file_tree, loader=ANY)
             mock_app_instance.run.assert_called_once()
 
 
@@ -259,4 +269,132 @@ async def test_toggle_safe_guard(mock_file_tree):
         tree.select_node(tree.root.children[-1])
         
         await pilot.press("space") 
-        assert app.is_running
\ No newline at end of file
+        assert app.is_running
+
+@pytest.mark.asyncio
+async def test_unlisted_directories_load_on_demand(tmp_path):
+    """Test that a shallow tree lists directories only when expanded or selected."""
+    for relpath in ["folder/file1.py", "folder/sub/file2.py", "root_file.txt"]:
+        (tmp_path / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relpath).write_text("")
+    picker = DefaultPicker(use_cache=False)
+    nodes = picker.pick_shallow(str(tmp_path))
+    app = _PickerApp(nodes, loader=lambda node: picker.expand(node, str(tmp_path)))
+    async with app.run_test() as pilot:
+        tree = app.query_one(Tree)
+        folder_ui_node = tree.root.children[0]
+        assert folder_ui_node.allow_expand and folder_ui_node.data.children is None
+
+        folder_ui_node.expand()
+        await pilot.pause()
+        assert [str(child.label) for child in folder_ui_node.children] == ["[ ] file1.py", "[ ] sub"]
+        assert folder_ui_node.children[1].data.children is None
+
+        tree.select_node(folder_ui_node)
+        await pilot.press("space")
+        assert str(tmp_path / "folder" / "sub" / "file2.py") in app.selected_paths
+
+
+@pytest.mark.asyncio
+async def test_cached_states_match_fresh_computation(mock_file_tree):
+    """Test that selection states stay correct as toggles update the state cache."""
+    app = _PickerApp(mock_file_tree)
+    async with app.run_test() as pilot:
+        tree = app.query_one(Tree)
+        folder_ui_node = tree.root.children[0]
+        folder_ui_node.expand()
+        await pilot.pause()
+        file1_ui_node = folder_ui_node.children[0]
+
+        for ui_node in (file1_ui_node, folder_ui_node, file1_ui_node, tree.root.children[1]):
+            tree.select_node(ui_node)
+            await pilot.press("space")
+
+            cached = {n.path: app._get_selection_state(n) for n in [mock_file_tree[0], *mock_file_tree[0].children]}
+            app._state_cache.clear()
+            fresh = {n.path: app._get_selection_state(n) for n in [mock_file_tree[0], *mock_file_tree[0].children]}
+            assert cached == fresh
+
+
+def test_absolute_paths_resolve_symlinks(tmp_path):
+    """Test that the slice lookup maps real paths, including through symlinked directories."""
+    (tmp_path / "real").mkdir()
+    (tmp_path / "real" / "a.py").write_text("")
+    (tmp_path / "link").symlink_to(tmp_path / "real")
+    nodes = DefaultPicker().pick(str(tmp_path))
+
+    mapping = _PickerApp(nodes)._absolute_to_node_paths()
+
+    real_file = os.path.realpath(tmp_path / "real" / "a.py")
+    assert mapping[real_file] in {str(tmp_path / "real" / "a.py"), str(tmp_path / "link" / "a.py")}
+    assert mapping[os.path.realpath(tmp_path)] == str(tmp_path)
+    assert all(real == os.path.realpath(path) for real, path in mapping.items())
+
+
+@pytest.mark.asyncio
+async def test_slice_selects_matched_dependencies(tmp_path):
+    """Test that slicing checks the files the dependencies resolve to, and nothing else."""
+    (tmp_path / "a.py").write_text("def f(): pass\n")
+    (tmp_path / "b.py").write_text("")
+    (tmp_path / "c.py").write_text("")
+    nodes = DefaultPicker().pick(str(tmp_path))
+    deps = {os.path.realpath(tmp_path / "a.py"), os.path.realpath(tmp_path / "b.py"), "/elsewhere/x.py"}
+
+    app = _PickerApp(nodes)
+    async with app.run_test() as pilot:
+        tree = app.query_one(Tree)
+        tree.select_node(tree.root.children[0])
+
+        with patch("gitex.picker.textuals.get_symbols_in_file", return_value=["f"]), \
+             patch("gitex.picker.textuals.resolve_slice_dependencies", return_value=deps), \
+             patch.object(app, "push_screen", side_effect=lambda screen, callback: callback("f")):
+            await app.action_slice()
+
+        assert app.selected_paths == {str(tmp_path / "a.py"), str(tmp_path / "b.py")}
+        assert [str(child.label) for child in tree.root.children] == ["[✓] a.py", "[✓] b.py", "[ ] c.py"]
+        assert str(tree.root.label) == "[-] ."
+
+
+@pytest.mark.asyncio
+async def test_cursor_stays_visible_while_navigating():
+    """Test that moving the cursor past the viewport scrolls the tree along."""
+    files = [FileNode(name=f"f{i:02}.py", path=f"root/f{i:02}.py", node_type=NodeType.FILE) for i in range(60)]
+    root = FileNode(name=".", path="root", node_type=NodeType.DIRECTORY, children=files)
+    app = _PickerApp([root])
+    async with app.run_test(size=(60, 20)) as pilot:
+        tree = app.query_one(Tree)
+        for _ in range(40):
+            await pilot.press("down")
+        await pilot.pause()
+
+        top = tree.scroll_offset.y
+        assert top > 0
+        assert top <= tree.cursor_line < top + tree.scrollable_content_region.height
+
+
+@pytest.mark.asyncio
+async def test_toggle_repaints_visible_descendants(mock_file_tree):
+    """Test that toggling a folder repaints its expanded children, not just their labels."""
+    app = _PickerApp(mock_file_tree)
+    async with app.run_test() as pilot:
+        tree = app.query_one(Tree)
+        folder_ui_node = tree.root.children[0]
+        folder_ui_node.expand()
+        await pilot.pause()
+        rendered = lambda: [tree.render_line(y).text for y in range(5)]
+        assert any("[ ] file1.py" in line for line in rendered())
+
+        tree.select_node(folder_ui_node)
+        await pilot.press("space")
+        await pilot.pause()
+
+        lines = rendered()
+        assert any("[✓] file1.py" in line for line in lines)
+        assert any("[✓] file2.py" in line for line in lines)
+        assert any("[-] ." in line for line in lines)
+
+        # The root has no parent label to update, so only its own repaint shows the change
+        tree.select_node(tree.root)
+        await pilot.press("space")
+        await pilot.pause()
+        assert any("[✓] root_file.txt" in line for line in rendered())